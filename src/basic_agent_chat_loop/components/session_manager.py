@@ -7,6 +7,9 @@ human-readable markdown and machine-readable JSON formats.
 
 import json
 import logging
+import mmap
+import os
+from collections.abc import Iterator
 from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
@@ -18,6 +21,38 @@ logger = logging.getLogger(__name__)
 # Owner read/write only - ensures session data remains private
 SECURE_FILE_PERMISSIONS = 0o600
 
+# Index log size (in records) below which it is never compacted
+INDEX_COMPACT_MIN_RECORDS = 64
+
+
+def _write_file(path: Path, data: bytes) -> None:
+    """
+    Atomically write bytes to an owner-only (0600) file.
+
+    Data goes to a freshly created temp file, so the mode applies even when
+    replacing an existing file, and is then renamed over the destination.
+
+    Args:
+        path: Destination file
+        data: Complete file contents
+    """
+    tmp_path = path.with_name(path.name + ".tmp")
+    tmp_path.unlink(missing_ok=True)  # Leftover from an interrupted write
+
+    flags = os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, "O_BINARY", 0)
+    fd = os.open(tmp_path, flags, SECURE_FILE_PERMISSIONS)
+    try:
+        try:
+            view = memoryview(data)
+            while view:
+                view = view[os.write(fd, view) :]
+        finally:
+            os.close(fd)
+        os.replace(tmp_path, path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
 
 @dataclass
 class SessionInfo:
@@ -31,6 +66,11 @@ class SessionInfo:
     query_count: int
     total_tokens: int
     preview: str  # First query text
+    preview_lower: str = ""  # Lowercased preview for search (derived if empty)
+
+    def __post_init__(self) -> None:
+        if not self.preview_lower:
+            self.preview_lower = self.preview.lower()
 
     def to_dict(self) -> dict[str, Any]:
         """Convert to dictionary for JSON serialization."""
@@ -43,6 +83,7 @@ class SessionInfo:
             "query_count": self.query_count,
             "total_tokens": self.total_tokens,
             "preview": self.preview,
+            "preview_lower": self.preview_lower,
         }
 
     @classmethod
@@ -57,6 +98,7 @@ class SessionInfo:
             query_count=data["query_count"],
             total_tokens=data["total_tokens"],
             preview=data["preview"],
+            preview_lower=data.get("preview_lower", ""),
         )
 
 
@@ -72,7 +114,13 @@ class SessionManager:
                          (defaults to ./.chat-sessions in current directory)
         """
         self.sessions_dir = sessions_dir or Path.cwd() / ".chat-sessions"
-        self.index_file = self.sessions_dir / ".index.json"
+        self.index_file = self.sessions_dir / ".index.jsonl"
+        self.legacy_index_file = self.sessions_dir / ".index.json"
+
+        # Folded index (session_id -> entry, oldest save first), valid while
+        # the log's (mtime_ns, size) still matches _index_stat
+        self._index_cache: Optional[dict[str, dict[str, Any]]] = None
+        self._index_stat: Optional[tuple[int, int]] = None
 
     def _ensure_sessions_dir(self) -> bool:
         """
@@ -88,39 +136,148 @@ class SessionManager:
             logger.error(f"Failed to create sessions directory: {e}")
             return False
 
+    def _migrate_legacy_index(self) -> None:
+        """Convert a pre-JSONL .index.json into the append-only index log."""
+        if self.index_file.exists() or not self.legacy_index_file.exists():
+            return
+
+        try:
+            with open(self.legacy_index_file, encoding="utf-8") as f:
+                data = json.load(f)
+            entries = data.get("sessions", []) if isinstance(data, dict) else []
+            if not isinstance(entries, list):
+                entries = []
+        except Exception as e:
+            logger.error(f"Failed to read legacy index, starting fresh: {e}")
+            entries = []
+
+        sessions = [s for s in entries if isinstance(s, dict) and "session_id" in s]
+        if len(sessions) != len(entries):
+            logger.warning(
+                f"Skipping {len(entries) - len(sessions)} invalid legacy index "
+                "entries"
+            )
+
+        if self._rewrite_index(sessions):
+            self.legacy_index_file.unlink()
+            logger.info("Migrated session index to append-only format")
+
+    def _index_file_stat(self) -> Optional[tuple[int, int]]:
+        """Return (mtime_ns, size) of the index log, or None if missing."""
+        try:
+            st = self.index_file.stat()
+        except OSError:
+            return None
+        return st.st_mtime_ns, st.st_size
+
+    @staticmethod
+    def _apply_index_record(
+        live: dict[str, dict[str, Any]], record: dict[str, Any]
+    ) -> bool:
+        """
+        Fold one index log record into the live session mapping.
+
+        Args:
+            live: session_id -> entry, in order of most recent save
+            record: Session entry or {"deleted": session_id} tombstone
+
+        Returns:
+            True if the record was recognised, False otherwise
+        """
+        if "deleted" in record:
+            live.pop(record["deleted"], None)
+        elif "session_id" in record:
+            # Re-insert so dict order tracks most recent save
+            live.pop(record["session_id"], None)
+            live[record["session_id"]] = record
+        else:
+            return False
+        return True
+
     def _load_index(self) -> dict[str, Any]:
         """
-        Load session index.
+        Load session index by replaying the index log.
+
+        Each line is either a session entry (added or updated) or a
+        {"deleted": session_id} tombstone. Later lines win. The folded
+        result is cached until the log changes on disk.
 
         Returns:
-            Index dictionary with sessions list
+            Index dictionary with sessions list, most recent first
         """
-        if not self.index_file.exists():
-            return {"sessions": [], "last_updated": datetime.now().isoformat()}
+        self._migrate_legacy_index()
 
-        try:
-            with open(self.index_file, encoding="utf-8") as f:
-                data = json.load(f)
+        stat = self._index_file_stat()
+        if stat is None:
+            return {"sessions": []}
 
-            if not isinstance(data, dict) or "sessions" not in data:
-                logger.warning("Invalid index format, creating new index")
-                return {"sessions": [], "last_updated": datetime.now().isoformat()}
+        if self._index_cache is not None and stat == self._index_stat:
+            return {"sessions": list(reversed(self._index_cache.values()))}
 
-            return data
+        live: dict[str, dict[str, Any]] = {}
+        record_count = 0
+
+        try:
+            for line in self._iter_index_lines():
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError as e:
+                    logger.warning(f"Skipping corrupt index line: {e}")
+                    continue
+                if isinstance(record, dict) and self._apply_index_record(live, record):
+                    record_count += 1
 
-        except json.JSONDecodeError as e:
-            logger.error(f"Failed to parse index file: {e}")
-            return {"sessions": [], "last_updated": datetime.now().isoformat()}
         except Exception as e:
             logger.error(f"Failed to load index: {e}")
-            return {"sessions": [], "last_updated": datetime.now().isoformat()}
+            return {"sessions": []}
+
+        sessions = list(reversed(live.values()))
+
+        # Compact once superseded entries and tombstones dominate the log
+        if record_count > max(2 * len(sessions), INDEX_COMPACT_MIN_RECORDS):
+            self._rewrite_index(sessions)
+        else:
+            self._index_cache = live
+            self._index_stat = stat
+
+        return {"sessions": sessions}
 
-    def _save_index(self, index: dict[str, Any]) -> bool:
+    def _iter_index_lines(self) -> Iterator[bytes]:
+        """
+        Yield raw lines of the index log from a read-only memory map.
+
+        Lines are handed to json.loads as bytes, skipping a text decode
+        layer; the map is released before the caller rewrites the file.
+        Falls back to reading the file line by line where it cannot be
+        mapped (e.g. filesystems without mmap support).
+
+        Yields:
+            Index log lines, including trailing newlines
+        """
+        with open(self.index_file, "rb") as f:
+            # Empty files cannot be mapped
+            if os.fstat(f.fileno()).st_size == 0:
+                return
+            try:
+                mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except (OSError, ValueError) as e:
+                logger.debug(f"Could not map index, reading it instead: {e}")
+                yield from f
+                return
+            with mm:
+                yield from iter(mm.readline, b"")
+
+    def _append_index(self, records: list[dict[str, Any]]) -> bool:
         """
-        Save session index.
+        Append records to the index log in a single write.
+
+        If the cached index was current before the write, the records are
+        folded into it directly instead of re-reading the log later.
 
         Args:
-            index: Index dictionary to save
+            records: Session entries and/or tombstones, oldest first
 
         Returns:
             True if successful, False otherwise
@@ -128,20 +285,59 @@ class SessionManager:
         if not self._ensure_sessions_dir():
             return False
 
-        try:
-            # Update timestamp
-            index["last_updated"] = datetime.now().isoformat()
+        self._migrate_legacy_index()
 
-            # Write with pretty formatting
-            with open(self.index_file, "w", encoding="utf-8") as f:
-                json.dump(index, f, indent=2)
+        cache_current = (
+            self._index_cache is not None
+            and self._index_file_stat() == self._index_stat
+        )
 
-            return True
+        try:
+            with open(self.index_file, "a", encoding="utf-8") as f:
+                f.write("".join(json.dumps(r) + "\n" for r in records))
 
         except Exception as e:
             logger.error(f"Failed to save index: {e}")
+            self._index_cache = None
+            return False
+
+        if cache_current and self._index_cache is not None:
+            for record in records:
+                self._apply_index_record(self._index_cache, record)
+            self._index_stat = self._index_file_stat()
+        else:
+            self._index_cache = None
+
+        return True
+
+    def _rewrite_index(self, sessions: list[dict[str, Any]]) -> bool:
+        """
+        Replace the index log with one entry per live session.
+
+        Args:
+            sessions: Session entries, most recent first
+
+        Returns:
+            True if successful, False otherwise
+        """
+        if not self._ensure_sessions_dir():
             return False
 
+        tmp_file = self.index_file.with_name(self.index_file.name + ".tmp")
+        try:
+            with open(tmp_file, "w", encoding="utf-8") as f:
+                f.write("".join(json.dumps(s) + "\n" for s in reversed(sessions)))
+            tmp_file.replace(self.index_file)
+
+        except Exception as e:
+            logger.error(f"Failed to compact index: {e}")
+            self._index_cache = None
+            return False
+
+        self._index_cache = {s["session_id"]: s for s in reversed(sessions)}
+        self._index_stat = self._index_file_stat()
+        return True
+
     def _update_index(self, session_info: SessionInfo) -> bool:
         """
         Update index with session information.
@@ -152,17 +348,22 @@ class SessionManager:
         Returns:
             True if successful, False otherwise
         """
-        index = self._load_index()
+        return self._update_index_batch([session_info])
 
-        # Remove existing entry if present
-        index["sessions"] = [
-            s for s in index["sessions"] if s["session_id"] != session_info.session_id
-        ]
+    def _update_index_batch(self, session_infos: list[SessionInfo]) -> bool:
+        """
+        Update index with several sessions using a single append.
 
-        # Add new entry at the beginning (most recent first)
-        index["sessions"].insert(0, session_info.to_dict())
+        Later entries are treated as more recent, matching the order the
+        index would have after saving them one at a time.
 
-        return self._save_index(index)
+        Args:
+            session_infos: Session metadata to add/update, oldest first
+
+        Returns:
+            True if successful, False otherwise
+        """
+        return self._append_index([info.to_dict() for info in session_infos])
 
     def _update_index_simple(
         self,
@@ -210,14 +411,7 @@ class SessionManager:
         Returns:
             True if successful, False otherwise
         """
-        index = self._load_index()
-
-        # Remove entry
-        index["sessions"] = [
-            s for s in index["sessions"] if s["session_id"] != session_id
-        ]
-
-        return self._save_index(index)
+        return self._append_index([{"deleted": session_id}])
 
     def save_session(
         self,
@@ -249,71 +443,143 @@ class SessionManager:
             return False, "No conversation to save"
 
         try:
-            json_path = self.sessions_dir / f"{session_id}.json"
-            md_path = self.sessions_dir / f"{session_id}.md"
-
-            # Calculate metadata
-            total_tokens = sum(
-                (entry.get("usage") or {}).get("input_tokens", 0)
-                + (entry.get("usage") or {}).get("output_tokens", 0)
-                for entry in conversation
-            )
-
-            # Get first query for preview (truncate to 100 chars)
-            preview = conversation[0]["query"][:100] if conversation else ""
-            if len(conversation[0]["query"]) > 100:
-                preview += "..."
-
-            created = datetime.fromtimestamp(conversation[0]["timestamp"])
-            last_updated = datetime.fromtimestamp(conversation[-1]["timestamp"])
-
-            # Prepare JSON data
-            json_data = {
-                "session_id": session_id,
-                "agent_name": agent_name,
-                "agent_path": agent_path,
-                "agent_description": agent_description,
-                "created": created.isoformat(),
-                "last_updated": last_updated.isoformat(),
-                "metadata": {
-                    "total_queries": len(conversation),
-                    "total_tokens": total_tokens,
-                    "duration": metadata.get("duration", 0) if metadata else 0,
-                },
-                "conversation": conversation,
-            }
-
-            # Save JSON
-            with open(json_path, "w", encoding="utf-8") as f:
-                json.dump(json_data, f, indent=2)
-
-            # Set secure permissions (owner read/write only)
-            json_path.chmod(SECURE_FILE_PERMISSIONS)
-
-            # Save markdown (for human readability)
-            self._save_markdown(md_path, session_id, json_data)
-
-            # Update index
-            session_info = SessionInfo(
-                session_id=session_id,
-                agent_name=agent_name,
-                agent_path=agent_path,
-                created=created,
-                last_updated=last_updated,
-                query_count=len(conversation),
-                total_tokens=total_tokens,
-                preview=preview,
+            session_info = self._write_session_files(
+                session_id,
+                agent_name,
+                agent_path,
+                agent_description,
+                conversation,
+                metadata,
             )
 
             self._update_index(session_info)
 
             logger.info(f"Saved session: {session_id}")
-            return True, f"Session saved: {json_path}"
+            return True, f"Session saved: {self.sessions_dir / f'{session_id}.json'}"
 
         except Exception as e:
             logger.error(f"Failed to save session: {e}", exc_info=True)
             return False, f"Failed to save session: {e}"
 
+    def save_sessions_batch(
+        self, entries: list[dict[str, Any]]
+    ) -> list[tuple[bool, str]]:
+        """
+        Save several sessions, appending to the index log only once.
+
+        Args:
+            entries: One dict of save_session keyword arguments per session,
+                     oldest first
+
+        Returns:
+            List of (success, message) tuples in the same order as entries
+        """
+        if not self._ensure_sessions_dir():
+            return [(False, "Failed to create sessions directory")] * len(entries)
+
+        results: list[tuple[bool, str]] = []
+        saved: list[SessionInfo] = []
+
+        for entry in entries:
+            session_id = entry["session_id"]
+
+            if not entry.get("conversation"):
+                results.append((False, "No conversation to save"))
+                continue
+
+            try:
+                saved.append(self._write_session_files(**entry))
+            except Exception as e:
+                logger.error(f"Failed to save session: {e}", exc_info=True)
+                results.append((False, f"Failed to save session: {e}"))
+                continue
+
+            logger.info(f"Saved session: {session_id}")
+            json_path = self.sessions_dir / f"{session_id}.json"
+            results.append((True, f"Session saved: {json_path}"))
+
+        if saved:
+            self._update_index_batch(saved)
+
+        return results
+
+    def _write_session_files(
+        self,
+        session_id: str,
+        agent_name: str,
+        agent_path: str,
+        agent_description: str,
+        conversation: list[dict[str, Any]],
+        metadata: Optional[dict[str, Any]] = None,
+    ) -> SessionInfo:
+        """
+        Write session JSON and markdown files (does not touch the index).
+
+        Args:
+            session_id: Unique session identifier
+            agent_name: Name of the agent
+            agent_path: Path to agent file
+            agent_description: Agent description
+            conversation: Non-empty list of conversation entries
+            metadata: Optional additional metadata
+
+        Returns:
+            SessionInfo describing the saved session
+
+        Raises:
+            Exception: If writing either file fails
+        """
+        json_path = self.sessions_dir / f"{session_id}.json"
+        md_path = self.sessions_dir / f"{session_id}.md"
+
+        # Calculate metadata
+        total_tokens = sum(
+            (entry.get("usage") or {}).get("input_tokens", 0)
+            + (entry.get("usage") or {}).get("output_tokens", 0)
+            for entry in conversation
+        )
+
+        # Get first query for preview (truncate to 100 chars)
+        preview = conversation[0]["query"][:100] if conversation else ""
+        if len(conversation[0]["query"]) > 100:
+            preview += "..."
+
+        created = datetime.fromtimestamp(conversation[0]["timestamp"])
+        last_updated = datetime.fromtimestamp(conversation[-1]["timestamp"])
+
+        # Prepare JSON data
+        json_data = {
+            "session_id": session_id,
+            "agent_name": agent_name,
+            "agent_path": agent_path,
+            "agent_description": agent_description,
+            "created": created.isoformat(),
+            "last_updated": last_updated.isoformat(),
+            "metadata": {
+                "total_queries": len(conversation),
+                "total_tokens": total_tokens,
+                "duration": metadata.get("duration", 0) if metadata else 0,
+            },
+            "conversation": conversation,
+        }
+
+        # Save JSON (owner read/write only, replaced atomically)
+        _write_file(json_path, json.dumps(json_data, indent=2).encode("utf-8"))
+
+        # Save markdown (for human readability)
+        self._save_markdown(md_path, session_id, json_data)
+
+        return SessionInfo(
+            session_id=session_id,
+            agent_name=agent_name,
+            agent_path=agent_path,
+            created=created,
+            last_updated=last_updated,
+            query_count=len(conversation),
+            total_tokens=total_tokens,
+            preview=preview,
+        )
+
     def _save_markdown(
         self, md_path: Path, session_id: str, json_data: dict[str, Any]
     ) -> None:
@@ -369,12 +635,8 @@ class SessionManager:
 
             content_lines.append("\n---\n")
 
-        # Write to file
-        with open(md_path, "w", encoding="utf-8") as f:
-            f.writelines(content_lines)
-
-        # Set secure permissions
-        md_path.chmod(SECURE_FILE_PERMISSIONS)
+        # Write to file (owner read/write only, replaced atomically)
+        _write_file(md_path, "".join(content_lines).encode("utf-8"))
 
     def load_session(self, session_id: str) -> Optional[dict[str, Any]]:
         """
@@ -483,7 +745,10 @@ class SessionManager:
 
         for session_data in index["sessions"]:
             # Search in preview and agent name
-            preview = session_data.get("preview", "").lower()
+            # (entries written before preview_lower existed fall back to lower())
+            preview = session_data.get("preview_lower") or (
+                session_data.get("preview", "").lower()
+            )
             agent_name = session_data.get("agent_name", "").lower()
 
             if query_lower in preview or query_lower in agent_name:
@@ -9,8 +9,12 @@ Manages all session-related state including:
 """
 
 import time
+from collections.abc import Callable
 from datetime import datetime
 
+# Characters in agent names that are replaced with "_" in session IDs
+_SANITIZE = str.maketrans({" ": "_", "/": "_"})
+
 
 class SessionState:
     """Manages session state for a chat loop session.
@@ -19,16 +23,33 @@ class SessionState:
     last query/response for copy commands, and token usage for delta calculation.
     """
 
-    def __init__(self, agent_name: str):
+    __slots__ = (
+        "_time",
+        "_agent_name",
+        "_id_prefix",
+        "session_id",
+        "query_count",
+        "conversation_markdown",
+        "last_query",
+        "last_response",
+        "session_start_time",
+        "last_accumulated_input",
+        "last_accumulated_output",
+    )
+
+    def __init__(self, agent_name: str, time_func: Callable[[], float] = time.time):
         """Initialize session state.
 
         Args:
             agent_name: Name of the agent for session ID generation
+            time_func: Clock used for session timing (defaults to time.time)
         """
+        self._time = time_func
+
         # Generate session ID
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        safe_agent_name = agent_name.lower().replace(" ", "_").replace("/", "_")
-        self.session_id = f"{safe_agent_name}_{timestamp}"
+        self._agent_name = agent_name
+        self._id_prefix = agent_name.lower().translate(_SANITIZE)
+        self.session_id = self._new_session_id()
 
         # Query and conversation tracking
         self.query_count = 0
@@ -39,7 +60,7 @@ class SessionState:
         self.last_response = ""
 
         # Session timing
-        self.session_start_time = time.time()
+        self.session_start_time = self._time()
 
         # Accumulated usage tracking for AWS Strands delta calculation
         # (AWS Strands reports cumulative usage, we need deltas)
@@ -89,7 +110,7 @@ class SessionState:
         Returns:
             Session duration in seconds since start
         """
-        return time.time() - self.session_start_time
+        return self._time() - self.session_start_time
 
     def update_accumulated_usage(
         self, current_input: int, current_output: int
@@ -118,6 +139,9 @@ class SessionState:
     def get_conversation_history(self) -> list[str]:
         """Get full conversation history.
 
+        Returns a copy of the entry list; use has_conversation_history() when
+        only checking for entries.
+
         Returns:
             List of conversation entries in markdown format
         """
@@ -129,7 +153,7 @@ class SessionState:
         Returns:
             True if there are conversation entries
         """
-        return len(self.conversation_markdown) > 0
+        return bool(self.conversation_markdown)
 
     def has_last_query(self) -> bool:
         """Check if there is a last query to copy.
@@ -147,6 +171,14 @@ class SessionState:
         """
         return bool(self.last_response)
 
+    def _new_session_id(self) -> str:
+        """Build a session ID from the cached agent prefix and current time.
+
+        Returns:
+            Session ID in the form ``<agent>_YYYYMMDD_HHMMSS``
+        """
+        return f"{self._id_prefix}_{datetime.now():%Y%m%d_%H%M%S}"
+
     def reset(self, agent_name: str) -> None:
         """Reset session state (for clear command).
 
@@ -155,10 +187,11 @@ class SessionState:
         Args:
             agent_name: Name of the agent for new session ID generation
         """
-        # Generate new session ID
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        safe_agent_name = agent_name.lower().replace(" ", "_").replace("/", "_")
-        self.session_id = f"{safe_agent_name}_{timestamp}"
+        # Generate new session ID, reusing the sanitized prefix for the same agent
+        if agent_name != self._agent_name:
+            self._agent_name = agent_name
+            self._id_prefix = agent_name.lower().translate(_SANITIZE)
+        self.session_id = self._new_session_id()
 
         # Reset counters
         self.query_count = 0
@@ -167,7 +200,7 @@ class SessionState:
         self.last_response = ""
 
         # Reset timing
-        self.session_start_time = time.time()
+        self.session_start_time = self._time()
 
         # Reset accumulated usage
         self.last_accumulated_input = 0
@@ -7,6 +7,7 @@ Handles multiple streaming event formats from different agent frameworks:
 - Generic streaming formats
 """
 
+from collections.abc import Callable
 from typing import Any, Optional
 
 
@@ -17,6 +18,15 @@ class StreamingEventParser:
     interface for text extraction from various agent frameworks.
     """
 
+    def __init__(self) -> None:
+        """Initialize the parser and its exact-type dispatch table."""
+        # Plain str/dict events are the common streaming case, so look them
+        # up by exact type; subclasses and objects take the attribute path.
+        self._dispatch: dict[type, Callable[[Any], Optional[str]]] = {
+            str: self._parse_str_event,
+            dict: self._parse_dict_event,
+        }
+
     def parse_event(self, event: Any) -> Optional[str]:
         """Extract text from a streaming event.
 
@@ -46,7 +56,33 @@ class StreamingEventParser:
             >>> parser.parse_event('Direct text')
             'Direct text'
         """
-        # First check if event is a dict (AWS Strands format)
+        handler = self._dispatch.get(type(event))
+        if handler is not None:
+            return handler(event)
+
+        return self._parse_object_event(event)
+
+    def _parse_str_event(self, event: str) -> Optional[str]:
+        """Parse plain string events (the event is the text itself).
+
+        Args:
+            event: String event
+
+        Returns:
+            The event unchanged
+        """
+        return event
+
+    def _parse_object_event(self, event: Any) -> Optional[str]:
+        """Parse events that are not plain str/dict instances.
+
+        Args:
+            event: Event object (or str/dict subclass) to parse
+
+        Returns:
+            Extracted text or None
+        """
+        # Dict subclasses use the AWS Strands/simple dict parsing
         if isinstance(event, dict):
             return self._parse_dict_event(event)
 
@@ -79,14 +115,13 @@ class StreamingEventParser:
         """
         # AWS Strands nested dict format:
         # {'event': {'contentBlockDelta': {'delta': {'text': '...'}}}}
-        if "event" in event and isinstance(event["event"], dict):
-            nested_event = event["event"]
-            if "contentBlockDelta" in nested_event:
-                delta_block = nested_event["contentBlockDelta"]
-                if isinstance(delta_block, dict) and "delta" in delta_block:
-                    delta = delta_block["delta"]
-                    if isinstance(delta, dict) and "text" in delta:
-                        return delta["text"]
+        nested_event = event.get("event")
+        if isinstance(nested_event, dict):
+            delta_block = nested_event.get("contentBlockDelta")
+            if isinstance(delta_block, dict):
+                delta = delta_block.get("delta")
+                if isinstance(delta, dict) and "text" in delta:
+                    return delta["text"]
 
         # Fallback: check for direct text field
         if "text" in event:
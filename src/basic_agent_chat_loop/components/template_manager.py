@@ -5,14 +5,145 @@ Handles loading and listing markdown-based prompt templates.
 """
 
 import logging
+import mmap
+import os
+import re
+import sys
+import threading
+from collections.abc import Iterator
 from pathlib import Path
 from typing import Optional
 
 logger = logging.getLogger(__name__)
 
+# Templates at least this large are memory-mapped when only the description
+# is needed, so listing them does not read the whole file
+DESCRIPTION_MMAP_MIN_SIZE = 64 * 1024
+
+# First-level markdown heading line: "# Title", indented by at most three
+# spaces as in CommonMark (four or more make it an indented code block)
+_HEADING_RE = re.compile(r" {0,3}#[ \t]+(.+?)[ \t]*")
+
+# Line that opens and closes a YAML front matter block
+_FRONT_MATTER_DELIMITER = "---"
+
+
+def _read_text(path: Path, size_hint: int) -> str:
+    """Read and decode a UTF-8 file with a single read in the common case.
+
+    Bypasses the buffered text layer; line endings are normalized the same
+    way text mode does.
+
+    Args:
+        path: File to read
+        size_hint: Expected size in bytes (from a preceding stat)
+
+    Returns:
+        Decoded file content
+    """
+    fd = os.open(path, os.O_RDONLY | getattr(os, "O_BINARY", 0))
+    try:
+        # Ask for one extra byte: a full read means the file grew since stat,
+        # a short one that it shrank or the read was partial. Either way,
+        # keep reading until EOF.
+        data = os.read(fd, size_hint + 1)
+        if len(data) != size_hint:
+            chunks = [data]
+            while chunk := os.read(fd, 65536):
+                chunks.append(chunk)
+            data = b"".join(chunks)
+    finally:
+        os.close(fd)
+
+    text = data.decode("utf-8")
+    if "\r" in text:
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+    return text
+
+
+def _iter_lines(content: str) -> Iterator[str]:
+    """Yield the lines of a string lazily, without line endings."""
+    start = 0
+    while start < len(content):
+        end = content.find("\n", start)
+        if end < 0:
+            yield content[start:]
+            return
+        yield content[start:end]
+        start = end + 1
+
+
+def _description_from_lines(lines: Iterator[str], name: str) -> str:
+    """Get a template description from its opening lines.
+
+    The description is a "# " heading (indented by at most three spaces)
+    on the first line, or on the first non-blank line after a YAML front
+    matter block that starts on line 1. Nothing further down is considered,
+    so comments in front matter or code blocks are never taken for the title.
+
+    Args:
+        lines: Template lines, without line endings
+        name: Template name, used when there is no heading
+
+    Returns:
+        Heading text, or the template name if there is none
+    """
+    line = next(lines, None)
+    if line is not None and line.rstrip() == _FRONT_MATTER_DELIMITER:
+        for line in lines:
+            if line.rstrip() == _FRONT_MATTER_DELIMITER:
+                break
+        else:
+            return name  # Unterminated front matter
+        line = next((line for line in lines if line.strip()), None)
+
+    if line is None:
+        return name
+    match = _HEADING_RE.fullmatch(line)
+    return match.group(1) if match else name
+
+
+def _extract_description(content: str, name: str) -> str:
+    """Extract a template description from its opening heading.
+
+    Args:
+        content: Template text
+        name: Template name, used when there is no heading
+
+    Returns:
+        Heading text, or the template name if there is none
+    """
+    return _description_from_lines(_iter_lines(content), name)
+
+
+def _scan_description(path: Path, name: str) -> str:
+    """Extract a description by reading a memory-mapped template file.
+
+    Only the pages holding the opening lines (and any front matter) are
+    touched.
+
+    Args:
+        path: Template file (must not be empty)
+        name: Template name, used when there is no heading
+
+    Returns:
+        Heading text, or the template name if there is none
+    """
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        lines = (line.decode("utf-8").rstrip("\r\n") for line in iter(mm.readline, b""))
+        return _description_from_lines(lines, name)
+
 
 class TemplateManager:
-    """Manage prompt templates from multiple directories with priority."""
+    """Manage prompt templates from multiple directories with priority.
+
+    Directory listings and parsed templates are cached in-process and
+    revalidated with a stat on every access (directory mtime for listings,
+    file mtime and size for contents) rather than a filesystem watcher, so
+    edits made during a session are picked up on the next lookup. An edit
+    that keeps the same size within the filesystem's timestamp granularity
+    can go unnoticed until the file changes again.
+    """
 
     def __init__(self, prompts_dir: Optional[Path] = None):
         """
@@ -34,8 +165,32 @@ class TemplateManager:
 
         # Keep prompts_dir for backward compatibility (used for initialization)
         self.prompts_dir = base_prompts_dir
+
+        # Parsed template files: path -> (mtime_ns, size, segments, description)
+        # where segments is the content split on the {input} placeholder, or
+        # None if only the description of a large file has been read
+        self._cache: dict[Path, tuple[int, int, Optional[list[str]], str]] = {}
+        # Template directory listings: dir -> (mtime_ns, {name: path})
+        self._dir_index: dict[Path, tuple[int, dict[str, Path]]] = {}
+        self._index_lock = threading.Lock()
+
         self._initialize_templates()
 
+        # List template directories in the background so the first lookup
+        # does not pay for cold directory scans
+        self._warm_thread = threading.Thread(
+            target=self._warm, args=(list(self.template_dirs),), daemon=True
+        )
+        self._warm_thread.start()
+
+    def _warm(self, template_dirs: list[Path]) -> None:
+        """Populate the directory index (runs on a background thread)."""
+        for template_dir in template_dirs:
+            try:
+                self._index(template_dir)
+            except Exception as e:
+                logger.debug(f"Could not index templates in {template_dir}: {e}")
+
     def _initialize_templates(self):
         """Create prompts directory and sample templates if they don't exist."""
         if self.prompts_dir.exists():
@@ -183,6 +338,189 @@ Begin loading files now.
             except Exception as e:
                 logger.debug(f"Could not create template {name}: {e}")
 
+    def _read_cached(self, path: Path) -> tuple[list[str], str]:
+        """Read a template file, reusing the cached copy while it is unchanged.
+
+        The cache entry is keyed by path and validated against the file's
+        mtime and size, so edits made during a session are picked up. The
+        content is split on {input} once here so rendering is a single join.
+
+        Args:
+            path: Path to the template file
+
+        Returns:
+            Tuple of (segments, description), where "{input}".join(segments)
+            is the raw template content
+
+        Raises:
+            OSError: If the file cannot be stat'ed or read
+        """
+        st = path.stat()
+        cached = self._cache.get(path)
+        if (
+            cached
+            and cached[0] == st.st_mtime_ns
+            and cached[1] == st.st_size
+            and cached[2] is not None
+        ):
+            return cached[2], cached[3]
+
+        return self._load(path, st)
+
+    def _read_description(self, path: Path) -> str:
+        """Get a template's description, reading as little as possible.
+
+        Large files that are not already cached are memory-mapped and
+        searched for the heading instead of being read in full (falling back
+        to a full read if the file cannot be mapped).
+
+        Args:
+            path: Path to the template file
+
+        Returns:
+            Template description
+
+        Raises:
+            OSError: If the file cannot be stat'ed or read
+        """
+        st = path.stat()
+        cached = self._cache.get(path)
+        if cached and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+            return cached[3]
+
+        if st.st_size < DESCRIPTION_MMAP_MIN_SIZE:
+            return self._load(path, st)[1]
+
+        try:
+            description = _scan_description(path, path.stem)
+        except (OSError, ValueError) as e:
+            # e.g. filesystems without mmap support: read the file instead
+            logger.debug(f"Could not map template {path}, reading it: {e}")
+            return self._load(path, st)[1]
+        self._cache[path] = (st.st_mtime_ns, st.st_size, None, description)
+        return description
+
+    def _load(self, path: Path, st: os.stat_result) -> tuple[list[str], str]:
+        """Read and parse a template file and store it in the cache.
+
+        Args:
+            path: Path to the template file
+            st: Result of the stat call made just before reading
+
+        Returns:
+            Tuple of (segments, description)
+        """
+        content = _read_text(path, st.st_size)
+        segments = content.split("{input}")
+        description = _extract_description(content, path.stem)
+        self._cache[path] = (st.st_mtime_ns, st.st_size, segments, description)
+        return segments, description
+
+    @staticmethod
+    def _iter_md(directory: Path) -> Iterator[tuple[str, Path]]:
+        """Yield (name, path) for each markdown template file in a directory.
+
+        Uses os.scandir so entries are filtered by name without globbing.
+        Names are interned since the same few are looked up repeatedly.
+        Results are in directory order, not sorted.
+
+        Args:
+            directory: Directory to scan (missing or unreadable directories
+                       yield nothing)
+        """
+        try:
+            with os.scandir(directory) as it:
+                for entry in it:
+                    if entry.name.endswith(".md") and entry.is_file():
+                        yield sys.intern(entry.name[:-3]), Path(entry.path)
+        except OSError as e:
+            logger.debug(f"Could not list templates in {directory}: {e}")
+            return
+
+    def _index(self, directory: Path) -> dict[str, Path]:
+        """Get the {name: path} template listing for a directory.
+
+        The listing is cached and rebuilt only when the directory's mtime
+        changes, which happens whenever a file is added, removed or renamed.
+
+        Args:
+            directory: Template directory
+
+        Returns:
+            Mapping of template name to file path (empty if directory missing)
+        """
+        # Serialized with the background warm-up started in __init__
+        with self._index_lock:
+            try:
+                mtime_ns = directory.stat().st_mtime_ns
+            except OSError:
+                self._dir_index.pop(directory, None)
+                return {}
+
+            cached = self._dir_index.get(directory)
+            if cached and cached[0] == mtime_ns:
+                return cached[1]
+
+            # Keep the existing Path objects for files that are still present
+            previous = cached[1] if cached else {}
+            index = {
+                name: previous.get(name, path)
+                for name, path in self._iter_md(directory)
+            }
+            self._dir_index[directory] = (mtime_ns, index)
+            return index
+
+    def _find(self, directory: Path, template_name: str) -> Optional[Path]:
+        """Find a template file by name in one directory.
+
+        Looks the name up in the directory listing first. On a miss, probes
+        the file directly, so case-insensitive filesystems (default macOS,
+        Windows) still resolve e.g. "Review" to review.md.
+
+        Args:
+            directory: Template directory
+            template_name: Name of the template (without .md extension)
+
+        Returns:
+            Path to the template file, or None if there is none
+        """
+        template_path = self._index(directory).get(template_name)
+        if template_path is None:
+            candidate = directory / f"{template_name}.md"
+            if candidate.is_file():
+                template_path = candidate
+        return template_path
+
+    def _merged_index(self) -> dict[str, Path]:
+        """Merge directory listings, keeping the highest-priority path per name.
+
+        Each template directory is listed once per call.
+
+        Returns:
+            Mapping of template name to the file that load_template would use
+        """
+        merged: dict[str, Path] = {}
+        for template_dir in self.template_dirs:
+            for name, path in self._index(template_dir).items():
+                merged.setdefault(name, path)
+        return merged
+
+    def _describe(self, template_name: str, path: Path) -> tuple[str, str]:
+        """Get (name, description) for a template file.
+
+        Args:
+            template_name: Name of the template
+            path: Path to the template file
+
+        Returns:
+            Tuple of (name, description); the name doubles as the description
+            if the file cannot be read
+        """
+        try:
+            return (template_name, self._read_description(path))
+        except Exception:
+            return (template_name, template_name)
+
     def load_template(self, template_name: str, input_text: str = "") -> Optional[str]:
         """
         Load a prompt template, checking directories in priority order.
@@ -199,19 +537,19 @@ Begin loading files now.
         """
         # Check directories in priority order (highest priority first)
         for template_dir in self.template_dirs:
-            template_path = template_dir / f"{template_name}.md"
+            try:
+                template_path = self._find(template_dir, template_name)
+                if template_path is None:
+                    continue
 
-            if not template_path.exists():
-                continue
+                segments, _ = self._read_cached(template_path)
 
-            try:
-                with open(template_path, encoding="utf-8") as f:
-                    template = f.read()
+                # Replace {input} placeholder(s) with provided text
+                if len(segments) > 1:
+                    return input_text.join(segments)
 
-                # Replace {input} placeholder with provided text
-                if "{input}" in template:
-                    template = template.replace("{input}", input_text)
-                elif input_text:
+                template = segments[0]
+                if input_text:
                     # If no {input} placeholder but input provided, append it
                     template = f"{template}\n\n{input_text}"
 
@@ -230,16 +568,7 @@ Begin loading files now.
         Returns:
             Sorted list of unique template names (without .md extension)
         """
-        templates = set()
-
-        for template_dir in self.template_dirs:
-            if not template_dir.exists():
-                continue
-
-            for file in template_dir.glob("*.md"):
-                templates.add(file.stem)
-
-        return sorted(templates)
+        return sorted(self._merged_index())
 
     def get_template_info(
         self, template_name: str, template_dir: Optional[Path] = None
@@ -258,24 +587,21 @@ Begin loading files now.
         dirs_to_check = [template_dir] if template_dir else self.template_dirs
 
         for dir_path in dirs_to_check:
-            template_path = dir_path / f"{template_name}.md"
+            template_path = self._find(dir_path, template_name)
+            if template_path is not None:
+                return self._describe(template_name, template_path)
 
-            if not template_path.exists():
-                continue
+        return None
 
-            try:
-                with open(template_path, encoding="utf-8") as f:
-                    first_line = f.readline().strip()
-                    # Extract description from markdown heading
-                    if first_line.startswith("# "):
-                        description = first_line[2:].strip()
-                    else:
-                        description = template_name
-                    return (template_name, description)
-            except Exception:
-                return (template_name, template_name)
+    def describe_templates(self) -> dict[str, str]:
+        """
+        Map each available template to its description.
 
-        return None
+        Returns:
+            Dict of template name to description, in sorted name order
+        """
+        merged = self._merged_index()
+        return dict(self._describe(name, merged[name]) for name in sorted(merged))
 
     def list_templates_with_descriptions(self) -> list[tuple[str, str]]:
         """
@@ -284,12 +610,7 @@ Begin loading files now.
         Returns:
             List of (name, description) tuples
         """
-        templates = []
-        for template_name in self.list_templates():
-            info = self.get_template_info(template_name)
-            if info:
-                templates.append(info)
-        return templates
+        return list(self.describe_templates().items())
 
     def list_templates_grouped(self) -> list[tuple[Path, list[tuple[str, str]]]]:
         """
@@ -302,15 +623,10 @@ Begin loading files now.
         grouped = []
 
         for template_dir in self.template_dirs:
-            if not template_dir.exists():
-                continue
-
-            templates_in_dir = []
-            for file in template_dir.glob("*.md"):
-                template_name = file.stem
-                info = self.get_template_info(template_name, template_dir)
-                if info:
-                    templates_in_dir.append(info)
+            templates_in_dir = [
+                self._describe(template_name, path)
+                for template_name, path in self._index(template_dir).items()
+            ]
 
             if templates_in_dir:
                 grouped.append((template_dir, sorted(templates_in_dir)))
@@ -36,11 +36,27 @@ class TokenTracker:
         """Get total tokens (input + output)."""
         return self.total_input_tokens + self.total_output_tokens
 
-    def format_tokens(self, tokens: int) -> str:
-        """Format token count with K/M suffix."""
-        if tokens >= 1_000_000:
-            return f"{tokens / 1_000_000:.1f}M"
-        elif tokens >= 1_000:
-            return f"{tokens / 1_000:.1f}K"
-        else:
+    @staticmethod
+    def format_tokens(tokens: int) -> str:
+        """
+        Format token count with K/M suffix.
+
+        Uses integer arithmetic, rounding half up to one decimal place.
+        Counts that would round to 1000.0K are shown as 1.0M instead.
+
+        Args:
+            tokens: Token count
+
+        Returns:
+            Formatted count, e.g. "500", "5.5K", "2.5M"
+        """
+        if tokens < 1_000:
             return str(tokens)
+
+        # Value in tenths of the unit, rounded half up
+        tenths = (int(tokens) * 10 + 500) // 1_000
+        suffix = "K"
+        if tenths >= 10_000:
+            tenths = (int(tokens) * 10 + 500_000) // 1_000_000
+            suffix = "M"
+        return f"{tenths // 10}.{tenths % 10}{suffix}"
@@ -4,23 +4,45 @@ UI Components for terminal display.
 Contains terminal color codes and status bar rendering.
 """
 
+import sys
 import time
-from typing import Optional
+from functools import lru_cache
+from typing import Optional, TextIO
 
-# Named color palette - maps color names to ANSI escape codes
+from .token_tracker import TokenTracker
+
+# Named color palette - maps color names to ANSI escape codes (interned, so
+# every reference to a palette color shares one string object)
 COLOR_PALETTE = {
-    "black": "\033[30m",
-    "red": "\033[31m",
-    "green": "\033[32m",
-    "yellow": "\033[33m",
-    "blue": "\033[34m",
-    "magenta": "\033[35m",
-    "cyan": "\033[36m",
-    "white": "\033[37m",
-    "bright_red": "\033[91m",
-    "bright_green": "\033[92m",
-    "bright_blue": "\033[94m",
-    "bright_white": "\033[97m",
+    name: sys.intern(code)
+    for name, code in {
+        "black": "\033[30m",
+        "red": "\033[31m",
+        "green": "\033[32m",
+        "yellow": "\033[33m",
+        "blue": "\033[34m",
+        "magenta": "\033[35m",
+        "cyan": "\033[36m",
+        "white": "\033[37m",
+        "bright_red": "\033[91m",
+        "bright_green": "\033[92m",
+        "bright_blue": "\033[94m",
+        "bright_white": "\033[97m",
+    }.items()
+}
+
+# Agent response lines starting with these are tool/thinking messages
+_TOOL_LINE_PREFIXES = ("[", "Tool #")
+
+# Config keys accepted by Colors.configure() and the attribute each one sets
+_CONFIG_KEY_TO_ATTR = {
+    "user": "USER",
+    "agent": "AGENT",
+    "system": "SYSTEM",
+    "error": "ERROR",
+    "success": "SUCCESS",
+    "dim": "DIM",
+    "reset": "RESET",
 }
 
 
@@ -28,16 +50,16 @@ class Colors:
     """ANSI color codes for terminal output."""
 
     # Default colors (can be overridden by config)
-    RESET = "\033[0m"
-    BOLD = "\033[1m"
-    DIM = "\033[2m"
+    RESET = sys.intern("\033[0m")
+    BOLD = sys.intern("\033[1m")
+    DIM = sys.intern("\033[2m")
 
     # Text colors - these will be updated from config
-    USER = "\033[97m"  # Bright white for user input (maximum contrast)
-    AGENT = "\033[94m"  # Bright blue for agent
-    SYSTEM = "\033[33m"  # Yellow for system messages
-    ERROR = "\033[91m"  # Bright red for errors
-    SUCCESS = "\033[92m"  # Bright green for success
+    USER = COLOR_PALETTE["bright_white"]  # User input (maximum contrast)
+    AGENT = COLOR_PALETTE["bright_blue"]  # Agent responses
+    SYSTEM = COLOR_PALETTE["yellow"]  # System messages
+    ERROR = COLOR_PALETTE["bright_red"]  # Errors
+    SUCCESS = COLOR_PALETTE["bright_green"]  # Success messages
 
     @classmethod
     def _resolve_color(cls, color_value: str) -> str:
@@ -51,11 +73,9 @@ class Colors:
         Returns:
             ANSI escape sequence
         """
-        # If it's a named color, look it up in the palette
-        if color_value in COLOR_PALETTE:
-            return COLOR_PALETTE[color_value]
-        # Otherwise, assume it's already an ANSI code (backward compatibility)
-        return color_value
+        # Named colors come from the palette; anything else is assumed to
+        # already be an ANSI code (backward compatibility)
+        return COLOR_PALETTE.get(color_value, color_value)
 
     @classmethod
     def configure(cls, config: dict[str, str]):
@@ -65,13 +85,10 @@ class Colors:
         Args:
             config: Dictionary of color names or ANSI codes
         """
-        cls.USER = cls._resolve_color(config.get("user", cls.USER))
-        cls.AGENT = cls._resolve_color(config.get("agent", cls.AGENT))
-        cls.SYSTEM = cls._resolve_color(config.get("system", cls.SYSTEM))
-        cls.ERROR = cls._resolve_color(config.get("error", cls.ERROR))
-        cls.SUCCESS = cls._resolve_color(config.get("success", cls.SUCCESS))
-        cls.DIM = cls._resolve_color(config.get("dim", cls.DIM))
-        cls.RESET = cls._resolve_color(config.get("reset", cls.RESET))
+        for key, value in config.items():
+            attr = _CONFIG_KEY_TO_ATTR.get(key)
+            if attr is not None:
+                setattr(cls, attr, cls._resolve_color(value))
 
     @staticmethod
     def user(text: str) -> str:
@@ -112,30 +129,45 @@ class Colors:
         Returns:
             Formatted text with color codes
         """
-        lines = text.split("\n")
-        formatted_lines = []
-
-        for line in lines:
-            # Check if line starts with '[' or 'Tool #'
-            if line.startswith("[") or line.startswith("Tool #"):
-                # Use bright_green for tool/thinking messages
-                formatted_lines.append(
-                    f"{COLOR_PALETTE['bright_green']}{line}{Colors.RESET}"
+        tool = COLOR_PALETTE["bright_green"]  # Tool/thinking messages
+        agent = Colors.AGENT
+        reset = Colors.RESET
+
+        return "\n".join(
+            [
+                (
+                    f"{tool}{line}{reset}"
+                    if line.startswith(_TOOL_LINE_PREFIXES)
+                    else f"{agent}{line}{reset}"
                 )
-            else:
-                # Use standard agent color
-                formatted_lines.append(f"{Colors.AGENT}{line}{Colors.RESET}")
-
-        return "\n".join(formatted_lines)
+                for line in text.split("\n")
+            ]
+        )
 
 
 class StatusBar:
     """Simple status bar for chat loop."""
 
-    # Token display formatting thresholds
+    # Token display formatting thresholds (kept for compatibility; the
+    # formatting itself is shared with TokenTracker.format_tokens)
     TOKEN_THOUSANDS_THRESHOLD = 1_000
     TOKEN_MILLIONS_THRESHOLD = 1_000_000
 
+    __slots__ = (
+        "agent_name",
+        "model_info",
+        "query_count",
+        "start_time",
+        "show_tokens",
+        "total_tokens",
+        "max_tokens",
+        "_last_elapsed",
+        "_last_session_time",
+        "_border_cache",
+        "_render_key",
+        "_rendered_lines",
+    )
+
     def __init__(
         self,
         agent_name: str,
@@ -160,22 +192,58 @@ class StatusBar:
         self.total_tokens = 0
         self.max_tokens = max_tokens
 
+        # Last formatted session time, reused until the elapsed second changes
+        self._last_elapsed = -1
+        self._last_session_time = ""
+
+        # Top/bottom border strings keyed by status line width
+        self._border_cache: dict[int, tuple[str, str]] = {}
+
+        # Last rendered lines and the displayed state they were built from
+        self._render_key: Optional[tuple] = None
+        self._rendered_lines: tuple[str, str, str] = ("", "", "")
+
     def get_session_time(self) -> str:
         """Get formatted session time."""
         elapsed = int(time.time() - self.start_time)
-        minutes = elapsed // 60
-        seconds = elapsed % 60
+        if elapsed == self._last_elapsed:
+            return self._last_session_time
+
+        minutes, seconds = divmod(elapsed, 60)
         if minutes > 0:
-            return f"{minutes}m {seconds}s"
-        return f"{seconds}s"
+            session_time = f"{minutes}m {seconds}s"
+        else:
+            session_time = f"{seconds}s"
+
+        self._last_elapsed = elapsed
+        self._last_session_time = session_time
+        return session_time
 
     def increment_query(self):
         """Increment query counter."""
         self.query_count += 1
 
     def update_tokens(self, total_tokens: int):
-        """Update total token count."""
-        self.total_tokens = total_tokens
+        """Update total token count (replaces the previous total)."""
+        # Stored as int so token formatting stays on integer arithmetic
+        self.total_tokens = int(total_tokens)
+
+    @staticmethod
+    @lru_cache(maxsize=128)
+    def _format_tokens(tokens: int) -> str:
+        """
+        Format a token count as e.g. "500 tokens", "5.5K tokens", "2.5M tokens".
+
+        Shares TokenTracker.format_tokens so the status bar and the per-query
+        token lines always agree.
+
+        Args:
+            tokens: Token count
+
+        Returns:
+            Formatted token string
+        """
+        return f"{TokenTracker.format_tokens(tokens)} tokens"
 
     def render(self) -> str:
         """
@@ -184,7 +252,44 @@ class StatusBar:
         Returns:
             Formatted status bar string
         """
+        top, middle, bottom = self._render_lines()
+        return f"{top}\n{middle}\n{bottom}"
+
+    def render_to(self, out: TextIO) -> None:
+        """
+        Write the status bar directly to a stream or buffer.
+
+        Writes the same text as render() (without a trailing newline) but
+        skips building the combined string.
+
+        Args:
+            out: Writable text stream (e.g. sys.stdout or io.StringIO)
+        """
+        top, middle, bottom = self._render_lines()
+        out.write(top)
+        out.write("\n")
+        out.write(middle)
+        out.write("\n")
+        out.write(bottom)
+
+    def _render_lines(self) -> tuple[str, str, str]:
+        """Build the top border, status line and bottom border.
+
+        Reuses the previous result when nothing displayed has changed.
+        """
         session_time = self.get_session_time()
+        key = (
+            self.agent_name,
+            self.model_info,
+            self.show_tokens,
+            self.total_tokens,
+            self.max_tokens,
+            self.query_count,
+            session_time,
+        )
+        if key == self._render_key:
+            return self._rendered_lines
+
         queries_text = "query" if self.query_count == 1 else "queries"
 
         # Build status line
@@ -195,16 +300,7 @@ class StatusBar:
 
         # Add tokens if enabled and available
         if self.show_tokens and self.total_tokens > 0:
-            if self.total_tokens >= self.TOKEN_MILLIONS_THRESHOLD:
-                token_str = (
-                    f"{self.total_tokens / self.TOKEN_MILLIONS_THRESHOLD:.1f}M tokens"
-                )
-            elif self.total_tokens >= self.TOKEN_THOUSANDS_THRESHOLD:
-                token_str = (
-                    f"{self.total_tokens / self.TOKEN_THOUSANDS_THRESHOLD:.1f}K tokens"
-                )
-            else:
-                token_str = f"{self.total_tokens} tokens"
+            token_str = self._format_tokens(self.total_tokens)
 
             # Add percentage if max_tokens is known
             if (
@@ -221,11 +317,16 @@ class StatusBar:
         parts.extend([f"{self.query_count} {queries_text}", session_time])
 
         status_line = " │ ".join(parts)
-        width = len(status_line) + 4  # Padding
-
-        # Create bordered status bar
-        top = "┌" + "─" * (width - 2) + "┐"
+        width = len(status_line) + 2  # Padding inside the vertical bars
+
+        # Create bordered status bar (borders only change with the width)
+        borders = self._border_cache.get(width)
+        if borders is None:
+            rule = "─" * width
+            borders = self._border_cache[width] = (f"┌{rule}┐", f"└{rule}┘")
+        top, bottom = borders
         middle = f"│ {status_line} │"
-        bottom = "└" + "─" * (width - 2) + "┘"
 
-        return f"{top}\n{middle}\n{bottom}"
+        self._render_key = key
+        self._rendered_lines = (top, middle, bottom)
+        return self._rendered_lines
@@ -1,6 +1,11 @@
 """Tests for multi-line input functionality."""
 
-from unittest.mock import Mock, patch
+import asyncio
+import readline
+from collections import deque
+from contextlib import ExitStack, contextmanager
+from types import SimpleNamespace
+from unittest.mock import patch
 
 import pytest
 
@@ -10,14 +15,66 @@ from basic_agent_chat_loop.components.input_handler import get_multiline_input
 # Patch to use regular input() for testing (bypass ESC detection)
 # This allows us to test with simple mocked input
 INPUT_PATCH_TARGET = "basic_agent_chat_loop.components.input_handler.input_with_esc"
+READLINE_PATCH_TARGET = (
+    "basic_agent_chat_loop.components.input_handler.READLINE_AVAILABLE"
+)
+
+# Input sequences shared across tests (immutable, built once at import)
+_SUBMIT_3 = ("line 1", "line 2", "line 3", "")
+_SUBMIT_2 = ("line 1", "line 2", "")
+_CANCEL_CMD = ("line 1", ".cancel")
+_CANCEL_ESC = ("line 1", None)  # None indicates ESC was pressed
+# Enter two lines, go back to edit line 2, re-enter it, submit
+_BACK_SEQ = ("line 1", "line 2", ".back", "line 2 edited", "")
+_UP_ARROW_SEQ = ("line 1", "line 2", "UP_ARROW", "line 2 edited", "")
+_UP_ARROW_EMPTY = ("UP_ARROW", "line 1", "")
+_BACK_EMPTY = (".back", "line 1", "")
+_EMPTY_FIRST = ("", "line 1", "")  # Empty first line warns and continues
+_MULTI_BACK_SEQ = (
+    "line 1",
+    "line 2",
+    "line 3",
+    ".back",  # Back to line 3
+    "line 3 edited",
+    ".back",  # Back to line 3 edited
+    "line 3 final",
+    "",  # Submit
+)
 
 
 @pytest.fixture
 def mock_agent():
     """Create a mock agent for testing."""
-    agent = Mock()
-    agent.stream_async = None  # No streaming support
-    return agent
+    return SimpleNamespace(stream_async=None)  # No streaming support
+
+
+@contextmanager
+def readline_env(side_effect):
+    """Patch input and force readline support on, in a single context."""
+    with ExitStack() as stack:
+        stack.enter_context(patch(INPUT_PATCH_TARGET, side_effect=side_effect))
+        stack.enter_context(patch(READLINE_PATCH_TARGET, True))
+        yield
+
+
+@pytest.fixture(scope="module")
+def run_multiline():
+    """Run get_multiline_input() on a single event loop shared by the module.
+
+    The coroutine never awaits under these mocks, so tests stay synchronous
+    instead of paying pytest-asyncio's per-test loop setup and teardown.
+    """
+    loop = asyncio.new_event_loop()
+    yield lambda: loop.run_until_complete(get_multiline_input())
+    loop.close()
+
+
+@pytest.fixture
+def history(monkeypatch):
+    """Record readline.add_history calls instead of touching real history."""
+    added = []
+    monkeypatch.setattr(readline, "add_history", added.append)
+    return added
 
 
 @pytest.fixture
@@ -31,198 +88,126 @@ def chat_loop(mock_agent):
     )
 
 
-@pytest.mark.asyncio
-async def test_multiline_input_submit(chat_loop):
+def test_multiline_input_submit(chat_loop, run_multiline):
     """Test basic multi-line input submission."""
     # Mock input to return lines then empty line to submit
-    inputs = ["line 1", "line 2", "line 3", ""]
-    with patch(INPUT_PATCH_TARGET, side_effect=inputs):
-        result = await get_multiline_input()
+    with patch(INPUT_PATCH_TARGET, side_effect=_SUBMIT_3):
+        result = run_multiline()
 
     assert result == "line 1\nline 2\nline 3"
 
 
-@pytest.mark.asyncio
-async def test_multiline_input_cancel_command(chat_loop):
+def test_multiline_input_cancel_command(chat_loop, run_multiline):
     """Test cancelling multi-line input with .cancel command."""
-    inputs = ["line 1", ".cancel"]
-    with patch(INPUT_PATCH_TARGET, side_effect=inputs):
-        result = await get_multiline_input()
+    with patch(INPUT_PATCH_TARGET, side_effect=_CANCEL_CMD):
+        result = run_multiline()
 
     assert result == ""
 
 
-@pytest.mark.asyncio
-async def test_multiline_input_cancel_esc(chat_loop):
+def test_multiline_input_cancel_esc(chat_loop, run_multiline):
     """Test cancelling multi-line input with ESC key."""
-    inputs = ["line 1", None]  # None indicates ESC was pressed
-    with patch(INPUT_PATCH_TARGET, side_effect=inputs):
-        result = await get_multiline_input()
+    with patch(INPUT_PATCH_TARGET, side_effect=_CANCEL_ESC):
+        result = run_multiline()
 
     assert result == ""
 
 
-@pytest.mark.asyncio
-async def test_multiline_input_cancel_ctrl_d(chat_loop):
+def test_multiline_input_cancel_ctrl_d(chat_loop, run_multiline):
     """Test cancelling multi-line input with Ctrl+D (EOFError)."""
 
     def mock_input_with_eof(prompt):
         raise EOFError()
 
     with patch(INPUT_PATCH_TARGET, side_effect=mock_input_with_eof):
-        result = await get_multiline_input()
+        result = run_multiline()
 
     assert result == ""
 
 
-@pytest.mark.asyncio
-async def test_multiline_input_cancel_ctrl_c(chat_loop):
+def test_multiline_input_cancel_ctrl_c(chat_loop, run_multiline):
     """Test cancelling multi-line input with Ctrl+C (KeyboardInterrupt)."""
 
     def mock_input_with_interrupt(prompt):
         raise KeyboardInterrupt()
 
     with patch(INPUT_PATCH_TARGET, side_effect=mock_input_with_interrupt):
-        result = await get_multiline_input()
+        result = run_multiline()
 
     assert result == ""
 
 
-@pytest.mark.asyncio
-async def test_multiline_input_back_command(chat_loop):
+def test_multiline_input_back_command(chat_loop, run_multiline, history):
     """Test editing previous line with .back command."""
-    # Simulate: enter two lines, use .back, re-enter line, submit
-    inputs = [
-        "line 1",
-        "line 2",
-        ".back",  # Go back to edit line 2
-        "line 2 edited",  # Re-enter the line
-        "",  # Submit
-    ]
-
-    with patch(INPUT_PATCH_TARGET, side_effect=inputs):
-        with patch(
-            "basic_agent_chat_loop.components.input_handler.READLINE_AVAILABLE", True
-        ):
-            with patch("readline.add_history"):
-                result = await get_multiline_input()
+    with readline_env(_BACK_SEQ):
+        result = run_multiline()
 
     assert result == "line 1\nline 2 edited"
 
 
-@pytest.mark.asyncio
-async def test_multiline_input_up_arrow(chat_loop):
+def test_multiline_input_up_arrow(chat_loop, run_multiline, history):
     """Test editing previous line with up arrow key."""
-    # Simulate: enter two lines, press up arrow, re-enter line, submit
-    inputs = [
-        "line 1",
-        "line 2",
-        "UP_ARROW",  # Up arrow pressed
-        "line 2 edited",  # Re-enter the line
-        "",  # Submit
-    ]
-
-    with patch(INPUT_PATCH_TARGET, side_effect=inputs):
-        with patch(
-            "basic_agent_chat_loop.components.input_handler.READLINE_AVAILABLE", True
-        ):
-            with patch("readline.add_history"):
-                result = await get_multiline_input()
+    with readline_env(_UP_ARROW_SEQ):
+        result = run_multiline()
 
     assert result == "line 1\nline 2 edited"
 
 
-@pytest.mark.asyncio
-async def test_multiline_input_up_arrow_on_empty(chat_loop):
+def test_multiline_input_up_arrow_on_empty(chat_loop, run_multiline):
     """Test up arrow when no previous lines exist."""
-    inputs = ["UP_ARROW", "line 1", ""]
-
-    with patch(INPUT_PATCH_TARGET, side_effect=inputs):
-        result = await get_multiline_input()
+    with patch(INPUT_PATCH_TARGET, side_effect=_UP_ARROW_EMPTY):
+        result = run_multiline()
 
     assert result == "line 1"
 
 
-@pytest.mark.asyncio
-async def test_multiline_input_back_on_empty(chat_loop):
+def test_multiline_input_back_on_empty(chat_loop, run_multiline):
     """Test .back command when no previous lines exist."""
-    inputs = [".back", "line 1", ""]
-
-    with patch(INPUT_PATCH_TARGET, side_effect=inputs):
-        result = await get_multiline_input()
+    with patch(INPUT_PATCH_TARGET, side_effect=_BACK_EMPTY):
+        result = run_multiline()
 
     assert result == "line 1"
 
 
-@pytest.mark.asyncio
-async def test_multiline_input_empty_first_line(chat_loop):
+def test_multiline_input_empty_first_line(chat_loop, run_multiline):
     """Test that empty first line shows warning and continues."""
-    inputs = [
-        "",  # Empty first line - should warn and continue
-        "line 1",
-        "",  # Submit
-    ]
-
-    with patch(INPUT_PATCH_TARGET, side_effect=inputs):
-        result = await get_multiline_input()
+    with patch(INPUT_PATCH_TARGET, side_effect=_EMPTY_FIRST):
+        result = run_multiline()
 
     assert result == "line 1"
 
 
-@pytest.mark.asyncio
-async def test_multiline_input_history_saved(chat_loop):
+def test_multiline_input_history_saved(chat_loop, run_multiline, history):
     """Test that multi-line input is saved to readline history."""
-    inputs = ["line 1", "line 2", ""]
-
-    with patch(INPUT_PATCH_TARGET, side_effect=inputs):
-        with patch(
-            "basic_agent_chat_loop.components.input_handler.READLINE_AVAILABLE", True
-        ):
-            with patch("readline.add_history") as mock_add_history:
-                _ = await get_multiline_input()
+    with readline_env(_SUBMIT_2):
+        _ = run_multiline()
 
     # Verify the full block was added to history
-    mock_add_history.assert_called_with("line 1\nline 2")
+    assert history[-1] == "line 1\nline 2"
 
 
-@pytest.mark.asyncio
-async def test_multiline_input_line_numbers(chat_loop):
+def test_multiline_input_line_numbers(chat_loop, run_multiline):
     """Test that line numbers are displayed in prompts."""
-    inputs = ["line 1", "line 2", ""]
+    next_input = deque(_SUBMIT_2).popleft
 
     prompts_received = []
+    record_prompt = prompts_received.append
 
     def capture_prompts(prompt):
-        prompts_received.append(prompt)
-        return inputs.pop(0)
+        record_prompt(prompt)
+        return next_input()
 
     with patch(INPUT_PATCH_TARGET, side_effect=capture_prompts):
-        _ = await get_multiline_input()
+        _ = run_multiline()
 
     # Check that prompts contain line numbers
     assert any("1" in p for p in prompts_received)
     assert any("2" in p for p in prompts_received)
 
 
-@pytest.mark.asyncio
-async def test_multiline_input_multiple_back_commands(chat_loop):
+def test_multiline_input_multiple_back_commands(chat_loop, run_multiline, history):
     """Test using .back multiple times to edit multiple lines."""
-    inputs = [
-        "line 1",
-        "line 2",
-        "line 3",
-        ".back",  # Back to line 3
-        "line 3 edited",
-        ".back",  # Back to line 3 edited
-        "line 3 final",
-        "",  # Submit
-    ]
-
-    with patch(INPUT_PATCH_TARGET, side_effect=inputs):
-        with patch(
-            "basic_agent_chat_loop.components.input_handler.READLINE_AVAILABLE", True
-        ):
-            with patch("readline.add_history"):
-                result = await get_multiline_input()
+    with readline_env(_MULTI_BACK_SEQ):
+        result = run_multiline()
 
     assert result == "line 1\nline 2\nline 3 final"
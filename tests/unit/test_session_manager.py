@@ -1,41 +1,63 @@
 """Tests for SessionManager component."""
 
 import json
+import logging
 import sys
-import time
 from datetime import datetime
+from unittest.mock import patch
 
 import pytest
 
-from basic_agent_chat_loop.components.session_manager import SessionInfo, SessionManager
+from basic_agent_chat_loop.components.session_manager import (
+    INDEX_COMPACT_MIN_RECORDS,
+    SessionInfo,
+    SessionManager,
+)
 
 
 @pytest.fixture
-def session_manager(tmp_path):
-    """Create SessionManager with temporary sessions directory."""
-    sessions_dir = tmp_path / "sessions"
+def session_manager(tmp_path_factory):
+    """Create SessionManager with a per-test sessions directory."""
+    # mktemp numbers each directory, so tests never share one
+    sessions_dir = tmp_path_factory.mktemp("session_manager") / "sessions"
     return SessionManager(sessions_dir=sessions_dir)
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def sample_conversation():
-    """Create sample conversation data for testing."""
-    return [
+    """Create sample conversation data for testing.
+
+    Shared across the module as a tuple; save_session only reads it.
+    """
+    return (
         {
-            "timestamp": time.time(),
+            "timestamp": 1_700_000_000.0,
             "query": "What is Python?",
             "response": "Python is a programming language...",
             "duration": 2.3,
             "usage": {"input_tokens": 234, "output_tokens": 456},
         },
         {
-            "timestamp": time.time() + 10,
+            "timestamp": 1_700_000_010.0,
             "query": "Tell me more",
             "response": "Python is widely used for...",
             "duration": 1.8,
             "usage": {"input_tokens": 123, "output_tokens": 567},
         },
-    ]
+    )
+
+
+def read_index_log(index_path):
+    """Fold the JSONL index log into the list of live session ids."""
+    live = {}
+    with open(index_path) as f:
+        for line in f:
+            record = json.loads(line)
+            if "deleted" in record:
+                live.pop(record["deleted"], None)
+            else:
+                live[record["session_id"]] = record
+    return list(live)
 
 
 class TestSessionManagerInitialization:
@@ -55,13 +77,61 @@ class TestSessionManagerInitialization:
         manager = SessionManager(sessions_dir=sessions_dir)
         assert manager.sessions_dir == sessions_dir
 
+    def test_legacy_index_is_migrated(self, tmp_path):
+        """Test that a pre-JSONL .index.json is converted on first use."""
+        sessions_dir = tmp_path / "sessions"
+        sessions_dir.mkdir()
+        entry = {
+            "session_id": "old_session",
+            "agent_name": "TestAgent",
+            "agent_path": "/path",
+            "created": "2025-01-26T14:30:00",
+            "last_updated": "2025-01-26T15:45:00",
+            "query_count": 1,
+            "total_tokens": 10,
+            "preview": "Old query",
+        }
+        (sessions_dir / ".index.json").write_text(json.dumps({"sessions": [entry]}))
+
+        manager = SessionManager(sessions_dir=sessions_dir)
+        sessions = manager.list_sessions()
+
+        assert [s.session_id for s in sessions] == ["old_session"]
+        assert not (sessions_dir / ".index.json").exists()
+        assert read_index_log(manager.index_file) == ["old_session"]
+
+    def test_malformed_legacy_index_entries_are_skipped(self, tmp_path, caplog):
+        """Test that legacy entries without a session_id are dropped on migration."""
+        sessions_dir = tmp_path / "sessions"
+        sessions_dir.mkdir()
+        entry = {
+            "session_id": "old_session",
+            "agent_name": "TestAgent",
+            "agent_path": "/path",
+            "created": "2025-01-26T14:30:00",
+            "last_updated": "2025-01-26T15:45:00",
+            "query_count": 1,
+            "total_tokens": 10,
+            "preview": "Old query",
+        }
+        legacy = {"sessions": [{"agent_name": "x", "preview": "p"}, "junk", entry]}
+        (sessions_dir / ".index.json").write_text(json.dumps(legacy))
+
+        manager = SessionManager(sessions_dir=sessions_dir)
+        with caplog.at_level(logging.WARNING):
+            sessions = manager.list_sessions()
+
+        assert [s.session_id for s in sessions] == ["old_session"]
+        assert "2 invalid legacy index entries" in caplog.text
+        assert not (sessions_dir / ".index.json").exists()
+        assert read_index_log(manager.index_file) == ["old_session"]
+        assert [s.session_id for s in manager.list_sessions()] == ["old_session"]
+
 
 class TestSaveSession:
     """Test saving sessions."""
 
-    def test_save_session_creates_files(
-        self, session_manager, sample_conversation, tmp_path
-    ):
+    def test_save_session_creates_files(self, session_manager, sample_conversation):
         """Test that save_session creates both JSON and markdown files."""
         success, message = session_manager.save_session(
             session_id="test_20250126_120000",
@@ -117,11 +187,24 @@ class TestSaveSession:
         index_path = session_manager.index_file
         assert index_path.exists()
 
-        with open(index_path) as f:
-            index = json.load(f)
+        assert read_index_log(index_path) == ["test_session"]
 
-        assert len(index["sessions"]) == 1
-        assert index["sessions"][0]["session_id"] == "test_session"
+    def test_save_session_appends_to_index(self, session_manager, sample_conversation):
+        """Test that each save appends one line rather than rewriting the index."""
+        for session_id in ("first", "second"):
+            session_manager.save_session(
+                session_id=session_id,
+                agent_name="TestAgent",
+                agent_path="/path/to/agent.py",
+                agent_description="Test",
+                conversation=sample_conversation,
+            )
+
+        lines = session_manager.index_file.read_text().splitlines()
+        assert [json.loads(line)["session_id"] for line in lines] == [
+            "first",
+            "second",
+        ]
 
     def test_save_empty_conversation_fails(self, session_manager):
         """Test that saving empty conversation fails."""
@@ -158,6 +241,30 @@ class TestSaveSession:
         assert oct(json_path.stat().st_mode)[-3:] == "600"
         assert oct(md_path.stat().st_mode)[-3:] == "600"
 
+    @pytest.mark.skipif(
+        sys.platform == "win32", reason="File permissions work differently on Windows"
+    )
+    def test_save_session_overwrite_restores_secure_permissions(
+        self, session_manager, sample_conversation
+    ):
+        """Test that re-saving replaces a world-readable file with a 0600 one."""
+        session_manager.sessions_dir.mkdir(parents=True)
+        json_path = session_manager.sessions_dir / "secure_session.json"
+        json_path.write_text("{}")
+        json_path.chmod(0o644)
+
+        session_manager.save_session(
+            session_id="secure_session",
+            agent_name="TestAgent",
+            agent_path="/path/to/agent.py",
+            agent_description="Test",
+            conversation=sample_conversation,
+        )
+
+        assert oct(json_path.stat().st_mode)[-3:] == "600"
+        assert json.loads(json_path.read_text())["session_id"] == "secure_session"
+        assert not list(session_manager.sessions_dir.glob("*.tmp"))
+
 
 class TestLoadSession:
     """Test loading sessions."""
@@ -196,15 +303,20 @@ class TestListSessions:
 
     def test_list_sessions_returns_all(self, session_manager, sample_conversation):
         """Test that list_sessions returns all saved sessions."""
-        # Save multiple sessions
-        for i in range(3):
-            session_manager.save_session(
-                session_id=f"session_{i}",
-                agent_name=f"Agent{i}",
-                agent_path="/path/to/agent.py",
-                agent_description="Test",
-                conversation=sample_conversation,
-            )
+        # Save multiple sessions with a single index write
+        results = session_manager.save_sessions_batch(
+            [
+                {
+                    "session_id": f"session_{i}",
+                    "agent_name": f"Agent{i}",
+                    "agent_path": "/path/to/agent.py",
+                    "agent_description": "Test",
+                    "conversation": sample_conversation,
+                }
+                for i in range(3)
+            ]
+        )
+        assert all(success for success, _ in results)
 
         sessions = session_manager.list_sessions()
         assert len(sessions) == 3
@@ -232,15 +344,19 @@ class TestListSessions:
 
     def test_list_sessions_respects_limit(self, session_manager, sample_conversation):
         """Test that list_sessions respects the limit parameter."""
-        # Save multiple sessions
-        for i in range(5):
-            session_manager.save_session(
-                session_id=f"session_{i}",
-                agent_name="TestAgent",
-                agent_path="/path/to/agent.py",
-                agent_description="Test",
-                conversation=sample_conversation,
-            )
+        # Save multiple sessions with a single index write
+        session_manager.save_sessions_batch(
+            [
+                {
+                    "session_id": f"session_{i}",
+                    "agent_name": "TestAgent",
+                    "agent_path": "/path/to/agent.py",
+                    "agent_description": "Test",
+                    "conversation": sample_conversation,
+                }
+                for i in range(5)
+            ]
+        )
 
         sessions = session_manager.list_sessions(limit=3)
         assert len(sessions) == 3
@@ -249,16 +365,19 @@ class TestListSessions:
         self, session_manager, sample_conversation
     ):
         """Test that sessions are returned in reverse chronological order."""
-        # Save sessions with delays to ensure different timestamps
-        for i in range(3):
-            session_manager.save_session(
-                session_id=f"session_{i}",
-                agent_name="TestAgent",
-                agent_path="/path/to/agent.py",
-                agent_description="Test",
-                conversation=sample_conversation,
-            )
-            time.sleep(0.01)
+        # Later entries in a batch are treated as saved later
+        session_manager.save_sessions_batch(
+            [
+                {
+                    "session_id": f"session_{i}",
+                    "agent_name": "TestAgent",
+                    "agent_path": "/path/to/agent.py",
+                    "agent_description": "Test",
+                    "conversation": sample_conversation,
+                }
+                for i in range(3)
+            ]
+        )
 
         sessions = session_manager.list_sessions()
         # Most recent (session_2) should be first
@@ -266,6 +385,113 @@ class TestListSessions:
         assert sessions[1].session_id == "session_1"
         assert sessions[2].session_id == "session_0"
 
+    def test_list_sessions_sees_changes_from_other_manager(
+        self, session_manager, sample_conversation
+    ):
+        """Test that the cached index is refreshed when the log changes on disk."""
+        session_manager.save_session(
+            session_id="session_a",
+            agent_name="TestAgent",
+            agent_path="/path/to/agent.py",
+            agent_description="Test",
+            conversation=sample_conversation,
+        )
+        assert len(session_manager.list_sessions()) == 1
+
+        other = SessionManager(sessions_dir=session_manager.sessions_dir)
+        other.save_session(
+            session_id="session_b",
+            agent_name="TestAgent",
+            agent_path="/path/to/agent.py",
+            agent_description="Test",
+            conversation=sample_conversation,
+        )
+
+        sessions = session_manager.list_sessions()
+        assert [s.session_id for s in sessions] == ["session_b", "session_a"]
+
+    def test_list_sessions_compacts_superseded_records(self, tmp_path):
+        """Test that a log dominated by stale records is rewritten on read."""
+        sessions_dir = tmp_path / "sessions"
+        sessions_dir.mkdir()
+        index_file = sessions_dir / ".index.jsonl"
+
+        def entry(session_id, query_count):
+            return {
+                "session_id": session_id,
+                "agent_name": "TestAgent",
+                "agent_path": "/path",
+                "created": "2025-01-26T14:30:00",
+                "last_updated": "2025-01-26T15:45:00",
+                "query_count": query_count,
+                "total_tokens": 10,
+                "preview": f"Query {session_id}",
+            }
+
+        rounds = INDEX_COMPACT_MIN_RECORDS // 4 + 1
+        records = [entry(session_id, n) for n in range(rounds) for session_id in "abcd"]
+        records += [{"deleted": "d"}, entry("a", 99)]
+        index_file.write_text("".join(json.dumps(r) + "\n" for r in records))
+        assert len(records) > INDEX_COMPACT_MIN_RECORDS
+
+        manager = SessionManager(sessions_dir=sessions_dir)
+        sessions = manager.list_sessions()
+
+        # Most recent save first: "a" was re-saved last, "d" was deleted
+        assert [s.session_id for s in sessions] == ["a", "c", "b"]
+        assert [s.query_count for s in sessions] == [99, rounds - 1, rounds - 1]
+
+        # One line per live session, oldest save first
+        lines = index_file.read_text().splitlines()
+        assert [json.loads(line)["session_id"] for line in lines] == ["b", "c", "a"]
+        assert list(sessions_dir.glob("*.tmp")) == []
+
+        # A fresh manager reads the compacted log the same way
+        fresh = SessionManager(sessions_dir=sessions_dir)
+        assert [s.session_id for s in fresh.list_sessions()] == ["a", "c", "b"]
+
+    @pytest.mark.parametrize(
+        "error",
+        [
+            pytest.param(OSError(19, "No such device"), id="oserror"),
+            pytest.param(ValueError("cannot mmap"), id="valueerror"),
+        ],
+    )
+    def test_list_sessions_without_mmap_support(
+        self, session_manager, sample_conversation, error
+    ):
+        """Test that the index is still read where it cannot be memory-mapped."""
+        session_manager.save_sessions_batch(
+            [
+                {
+                    "session_id": f"session_{i}",
+                    "agent_name": "TestAgent",
+                    "agent_path": "/path/to/agent.py",
+                    "agent_description": "Test",
+                    "conversation": sample_conversation,
+                }
+                for i in range(2)
+            ]
+        )
+        fresh = SessionManager(sessions_dir=session_manager.sessions_dir)
+
+        with patch("mmap.mmap", side_effect=error):
+            sessions = fresh.list_sessions()
+
+        assert [s.session_id for s in sessions] == ["session_1", "session_0"]
+
+    def test_list_sessions_empty_index_file(self, tmp_path, caplog):
+        """Test that an empty index log reads as no sessions, without errors."""
+        sessions_dir = tmp_path / "sessions"
+        sessions_dir.mkdir()
+        (sessions_dir / ".index.jsonl").write_bytes(b"")
+
+        manager = SessionManager(sessions_dir=sessions_dir)
+
+        with caplog.at_level(logging.WARNING):
+            assert manager.list_sessions() == []
+        assert caplog.records == []
+
 
 class TestDeleteSession:
     """Test deleting sessions."""
@@ -308,10 +534,8 @@ class TestDeleteSession:
 
         session_manager.delete_session("indexed_session")
 
-        with open(session_manager.index_file) as f:
-            index = json.load(f)
-
-        assert len(index["sessions"]) == 0
+        assert read_index_log(session_manager.index_file) == []
+        assert session_manager.list_sessions() == []
 
 
 class TestSearchSessions:
@@ -359,6 +583,41 @@ class TestSearchSessions:
         results = session_manager.search_sessions("PYTHON")
         assert len(results) == 1
 
+    def test_search_sessions_partial_and_multi_word(
+        self, session_manager, sample_conversation
+    ):
+        """Test that search keeps substring semantics across word boundaries."""
+        session_manager.save_session(
+            session_id="python_session",
+            agent_name="TestAgent",
+            agent_path="/path/to/agent.py",
+            agent_description="Test",
+            conversation=sample_conversation,  # First query is "What is Python?"
+        )
+
+        assert len(session_manager.search_sessions("pyth")) == 1
+        assert len(session_manager.search_sessions("at is py")) == 1
+        assert len(session_manager.search_sessions("python?")) == 1
+        assert session_manager.search_sessions("is what") == []
+
+    def test_search_sessions_reflects_saves_and_deletes(
+        self, session_manager, sample_conversation
+    ):
+        """Test that repeated searches pick up index changes."""
+        assert session_manager.search_sessions("Python") == []
+
+        session_manager.save_session(
+            session_id="python_session",
+            agent_name="TestAgent",
+            agent_path="/path/to/agent.py",
+            agent_description="Test",
+            conversation=sample_conversation,
+        )
+        assert len(session_manager.search_sessions("Python")) == 1
+
+        session_manager.delete_session("python_session")
+        assert session_manager.search_sessions("Python") == []
+
 
 class TestSessionInfo:
     """Test SessionInfo dataclass."""
@@ -380,6 +639,7 @@ class TestSessionInfo:
         assert data["session_id"] == "test"
         assert data["agent_name"] == "TestAgent"
         assert data["query_count"] == 10
+        assert data["preview_lower"] == "test query..."
 
     def test_session_info_from_dict(self):
         """Test SessionInfo creation from dictionary."""
@@ -398,6 +658,8 @@ class TestSessionInfo:
         assert info.session_id == "test"
         assert info.agent_name == "TestAgent"
         assert info.query_count == 10
+        # Older index entries have no preview_lower; it is derived
+        assert info.preview_lower == "test query..."
 
 
 class TestCleanupOldSessions:
@@ -1,9 +1,41 @@
 """Tests for SessionState component."""
 
+import itertools
 import time
+from datetime import datetime, timedelta
 
+import pytest
+
+from basic_agent_chat_loop.components import session_state as session_state_module
 from basic_agent_chat_loop.components.session_state import SessionState
 
+T0 = 1_700_000_000.0
+
+
+@pytest.fixture
+def state():
+    """Create a fresh SessionState for the default test agent."""
+    return SessionState("TestAgent")
+
+
+@pytest.fixture
+def fake_now(monkeypatch):
+    """Make datetime.now() advance one second per call in session_state."""
+    ticks = itertools.count()
+    start = datetime(2024, 1, 1, 12, 0, 0)
+
+    class FakeDateTime(datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return start + timedelta(seconds=next(ticks))
+
+    monkeypatch.setattr(session_state_module, "datetime", FakeDateTime)
+
+
+def scripted_clock(*times):
+    """Return a time_func that yields the given timestamps in order."""
+    return iter(times).__next__
+
 
 class TestSessionStateInitialization:
     """Test SessionState initialization."""
@@ -48,10 +80,9 @@ class TestSessionStateInitialization:
         after = time.time()
         assert before <= state.session_start_time <= after
 
-    def test_unique_session_ids(self):
+    def test_unique_session_ids(self, fake_now):
         """Test multiple instances get unique session IDs."""
         state1 = SessionState("TestAgent")
-        time.sleep(1.1)  # Ensure different timestamp
         state2 = SessionState("TestAgent")
         assert state1.session_id != state2.session_id
 
@@ -59,27 +90,23 @@ class TestSessionStateInitialization:
 class TestQueryCountManagement:
     """Test query count tracking."""
 
-    def test_increment_query_count(self):
+    def test_increment_query_count(self, state):
         """Test incrementing query count."""
-        state = SessionState("TestAgent")
         assert state.query_count == 0
 
         count = state.increment_query_count()
         assert count == 1
         assert state.query_count == 1
 
-    def test_multiple_increments(self):
+    def test_multiple_increments(self, state):
         """Test multiple query count increments."""
-        state = SessionState("TestAgent")
-
         for i in range(1, 6):
             count = state.increment_query_count()
             assert count == i
             assert state.query_count == i
 
-    def test_increment_returns_new_count(self):
+    def test_increment_returns_new_count(self, state):
         """Test increment returns the new count value."""
-        state = SessionState("TestAgent")
         result = state.increment_query_count()
         assert result == state.query_count
 
@@ -87,84 +114,55 @@ class TestQueryCountManagement:
 class TestLastQueryResponse:
     """Test last query/response tracking."""
 
-    def test_update_last_query(self):
-        """Test updating last query."""
-        state = SessionState("TestAgent")
-        state.update_last_query("What is Python?")
-        assert state.last_query == "What is Python?"
-
-    def test_update_last_query_multiple(self):
-        """Test updating last query multiple times."""
-        state = SessionState("TestAgent")
-        state.update_last_query("First query")
-        assert state.last_query == "First query"
-
-        state.update_last_query("Second query")
-        assert state.last_query == "Second query"
-
-    def test_update_last_response(self):
-        """Test updating last response."""
-        state = SessionState("TestAgent")
-        state.update_last_response("Python is a programming language.")
-        assert state.last_response == "Python is a programming language."
-
-    def test_update_last_response_multiple(self):
-        """Test updating last response multiple times."""
-        state = SessionState("TestAgent")
-        state.update_last_response("First response")
-        assert state.last_response == "First response"
-
-        state.update_last_response("Second response")
-        assert state.last_response == "Second response"
-
-    def test_has_last_query_initially_false(self):
-        """Test has_last_query is false initially."""
-        state = SessionState("TestAgent")
-        assert state.has_last_query() is False
-
-    def test_has_last_query_after_update(self):
-        """Test has_last_query is true after update."""
-        state = SessionState("TestAgent")
-        state.update_last_query("Test query")
-        assert state.has_last_query() is True
-
-    def test_has_last_query_empty_string(self):
-        """Test has_last_query with empty string."""
-        state = SessionState("TestAgent")
-        state.update_last_query("")
-        assert state.has_last_query() is False
-
-    def test_has_last_response_initially_false(self):
-        """Test has_last_response is false initially."""
-        state = SessionState("TestAgent")
-        assert state.has_last_response() is False
-
-    def test_has_last_response_after_update(self):
-        """Test has_last_response is true after update."""
-        state = SessionState("TestAgent")
-        state.update_last_response("Test response")
-        assert state.has_last_response() is True
-
-    def test_has_last_response_empty_string(self):
-        """Test has_last_response with empty string."""
-        state = SessionState("TestAgent")
-        state.update_last_response("")
-        assert state.has_last_response() is False
+    # (setter, attribute, has_* check) for query and response tracking
+    ACCESSORS = [
+        pytest.param("update_last_query", "last_query", "has_last_query", id="query"),
+        pytest.param(
+            "update_last_response", "last_response", "has_last_response", id="response"
+        ),
+    ]
+
+    @pytest.mark.parametrize("setter,attr,has", ACCESSORS)
+    @pytest.mark.parametrize(
+        "value,expected_has",
+        [
+            ("What is Python?", True),
+            ("Python is a programming language.", True),
+            ("", False),
+        ],
+    )
+    def test_update(self, state, setter, attr, has, value, expected_has):
+        """Test updating last query/response and the matching has_* check."""
+        getattr(state, setter)(value)
+        assert getattr(state, attr) == value
+        assert getattr(state, has)() is expected_has
+
+    @pytest.mark.parametrize("setter,attr,has", ACCESSORS)
+    def test_update_multiple(self, state, setter, attr, has):
+        """Test updating last query/response multiple times."""
+        getattr(state, setter)("First")
+        assert getattr(state, attr) == "First"
+
+        getattr(state, setter)("Second")
+        assert getattr(state, attr) == "Second"
+
+    @pytest.mark.parametrize("setter,attr,has", ACCESSORS)
+    def test_has_initially_false(self, state, setter, attr, has):
+        """Test has_last_query/has_last_response are false initially."""
+        assert getattr(state, has)() is False
 
 
 class TestConversationHistory:
     """Test conversation history management."""
 
-    def test_add_conversation_entry(self):
+    def test_add_conversation_entry(self, state):
         """Test adding conversation entry."""
-        state = SessionState("TestAgent")
         state.add_conversation_entry("User: Hello")
         assert len(state.conversation_markdown) == 1
         assert state.conversation_markdown[0] == "User: Hello"
 
-    def test_add_multiple_entries(self):
+    def test_add_multiple_entries(self, state):
         """Test adding multiple conversation entries."""
-        state = SessionState("TestAgent")
         state.add_conversation_entry("User: Hello")
         state.add_conversation_entry("Agent: Hi there!")
         state.add_conversation_entry("User: How are you?")
@@ -174,49 +172,37 @@ class TestConversationHistory:
         assert state.conversation_markdown[1] == "Agent: Hi there!"
         assert state.conversation_markdown[2] == "User: How are you?"
 
-    def test_get_conversation_history(self):
-        """Test getting conversation history."""
-        state = SessionState("TestAgent")
+    def test_get_conversation_history_returns_copy(self, state):
+        """Test get_conversation_history returns the entries as a copy."""
         state.add_conversation_entry("Entry 1")
         state.add_conversation_entry("Entry 2")
 
         history = state.get_conversation_history()
         assert history == ["Entry 1", "Entry 2"]
-
-    def test_get_conversation_history_returns_copy(self):
-        """Test get_conversation_history returns a copy."""
-        state = SessionState("TestAgent")
-        state.add_conversation_entry("Entry 1")
-
-        history = state.get_conversation_history()
-        history.append("Entry 2")
+        history.append("Entry 3")
 
         # Original should not be modified
-        assert len(state.conversation_markdown) == 1
+        assert state.conversation_markdown == ["Entry 1", "Entry 2"]
 
-    def test_clear_conversation_history(self):
+    def test_clear_conversation_history(self, state):
         """Test clearing conversation history."""
-        state = SessionState("TestAgent")
         state.add_conversation_entry("Entry 1")
         state.add_conversation_entry("Entry 2")
 
         state.clear_conversation_history()
-        assert len(state.conversation_markdown) == 0
+        assert state.conversation_markdown == []
 
-    def test_has_conversation_history_initially_false(self):
+    def test_has_conversation_history_initially_false(self, state):
         """Test has_conversation_history is false initially."""
-        state = SessionState("TestAgent")
         assert state.has_conversation_history() is False
 
-    def test_has_conversation_history_after_add(self):
+    def test_has_conversation_history_after_add(self, state):
         """Test has_conversation_history is true after adding entry."""
-        state = SessionState("TestAgent")
         state.add_conversation_entry("Entry 1")
         assert state.has_conversation_history() is True
 
-    def test_has_conversation_history_after_clear(self):
+    def test_has_conversation_history_after_clear(self, state):
         """Test has_conversation_history is false after clear."""
-        state = SessionState("TestAgent")
         state.add_conversation_entry("Entry 1")
         state.clear_conversation_history()
         assert state.has_conversation_history() is False
@@ -233,16 +219,16 @@ class TestSessionDuration:
 
     def test_get_session_duration_after_delay(self):
         """Test session duration after a delay."""
-        state = SessionState("TestAgent")
-        time.sleep(0.5)
+        state = SessionState("TestAgent", time_func=scripted_clock(T0, T0 + 0.5))
         duration = state.get_session_duration()
-        assert 0.4 <= duration <= 0.7  # Account for timing variance
+        assert duration == pytest.approx(0.5)
 
     def test_get_session_duration_increases(self):
         """Test session duration increases over time."""
-        state = SessionState("TestAgent")
+        state = SessionState(
+            "TestAgent", time_func=scripted_clock(T0, T0 + 0.5, T0 + 0.7)
+        )
         duration1 = state.get_session_duration()
-        time.sleep(0.2)
         duration2 = state.get_session_duration()
         assert duration2 > duration1
 
@@ -341,12 +327,11 @@ class TestReset:
         assert state.last_accumulated_input == 0
         assert state.last_accumulated_output == 0
 
-    def test_reset_generates_new_session_id(self):
+    def test_reset_generates_new_session_id(self, fake_now):
         """Test reset generates new session ID."""
         state = SessionState("TestAgent")
         old_session_id = state.session_id
 
-        time.sleep(1.1)  # Ensure different timestamp
         state.reset("TestAgent")
 
         assert state.session_id != old_session_id
@@ -354,10 +339,9 @@ class TestReset:
 
     def test_reset_resets_start_time(self):
         """Test reset resets session start time."""
-        state = SessionState("TestAgent")
+        state = SessionState("TestAgent", time_func=scripted_clock(T0, T0 + 0.5))
         old_start = state.session_start_time
 
-        time.sleep(0.5)
         state.reset("TestAgent")
 
         assert state.session_start_time > old_start
@@ -373,9 +357,8 @@ class TestReset:
 class TestStateSummary:
     """Test state summary functionality."""
 
-    def test_get_state_summary_initial(self):
+    def test_get_state_summary_initial(self, state):
         """Test state summary for initial state."""
-        state = SessionState("TestAgent")
         summary = state.get_state_summary()
 
         assert "session_id" in summary
@@ -386,9 +369,8 @@ class TestStateSummary:
         assert summary["accumulated_input"] == 0
         assert summary["accumulated_output"] == 0
 
-    def test_get_state_summary_with_data(self):
+    def test_get_state_summary_with_data(self, state):
         """Test state summary with populated data."""
-        state = SessionState("TestAgent")
         state.increment_query_count()
         state.increment_query_count()
         state.add_conversation_entry("Entry 1")
@@ -407,12 +389,11 @@ class TestStateSummary:
 
     def test_get_state_summary_includes_duration(self):
         """Test state summary includes session duration."""
-        state = SessionState("TestAgent")
-        time.sleep(0.3)
+        state = SessionState("TestAgent", time_func=scripted_clock(T0, T0 + 0.3))
 
         summary = state.get_state_summary()
         assert "session_duration" in summary
-        assert summary["session_duration"] >= 0.3
+        assert summary["session_duration"] == pytest.approx(0.3)
 
 
 class TestEdgeCases:
@@ -1,8 +1,17 @@
 """Tests for TemplateManager component."""
 
+import os
+import threading
+from unittest.mock import patch
+
 import pytest
 
-from basic_agent_chat_loop.components.template_manager import TemplateManager
+from basic_agent_chat_loop.components.template_manager import (
+    DESCRIPTION_MMAP_MIN_SIZE,
+    TemplateManager,
+)
+
+READ_PATCH_TARGET = "basic_agent_chat_loop.components.template_manager._read_text"
 
 
 @pytest.fixture
@@ -91,6 +100,16 @@ class TestListTemplates:
         assert len(templates) == 1
         assert "template" in templates
 
+    def test_list_templates_ignores_md_directories(self, prompts_dir):
+        """Test that directories ending in .md are not listed as templates."""
+        (prompts_dir / "template.md").write_text("Valid template")
+        (prompts_dir / "folder.md").mkdir()
+
+        manager = TemplateManager(prompts_dir)
+        manager.template_dirs = [prompts_dir]
+
+        assert manager.list_templates() == ["template"]
+
 
 class TestListTemplatesWithDescriptions:
     """Test listing templates with their descriptions."""
@@ -133,6 +152,85 @@ class TestListTemplatesWithDescriptions:
         assert templates_dict["review"] == "Code Review"  # Has heading
         assert templates_dict["complex"] == "Complex Template"  # Has heading
 
+    def test_list_with_descriptions_heading_after_front_matter(self, prompts_dir):
+        """Test that a heading below front matter is used as the description."""
+        (prompts_dir / "command.md").write_text(
+            "---\nallowed-tools: Bash\n---\n\n# Run Command\n\n{input}"
+        )
+
+        manager = TemplateManager(prompts_dir)
+        manager.template_dirs = [prompts_dir]
+        templates = manager.list_templates_with_descriptions()
+
+        assert templates == [("command", "Run Command")]
+
+    @pytest.mark.parametrize(
+        "content",
+        [
+            pytest.param(
+                "Set up the project:\n\n```bash\n# install deps first\n"
+                "pip install -e .\n```\n\n{input}\n",
+                id="code_fence_comment",
+            ),
+            pytest.param(
+                "```bash\n# install deps first\n```\n{input}\n",
+                id="opening_code_fence",
+            ),
+            pytest.param(
+                "    # not a heading, indented code\n\n{input}\n",
+                id="indented_code",
+            ),
+            pytest.param(
+                "---\n# yaml comment\nallowed-tools: Bash\n---\n\nRun {input}\n",
+                id="front_matter_comment",
+            ),
+        ],
+    )
+    def test_list_with_descriptions_ignores_non_heading_hashes(
+        self, prompts_dir, content
+    ):
+        """Test that "#" lines in code or front matter are not descriptions."""
+        (prompts_dir / "command.md").write_text(content)
+
+        manager = TemplateManager(prompts_dir)
+        manager.template_dirs = [prompts_dir]
+
+        assert manager.list_templates_with_descriptions() == [("command", "command")]
+
+    def test_list_with_descriptions_only_opening_heading(self, prompts_dir):
+        """Test that only a first-level heading on the opening line counts."""
+        (prompts_dir / "nested.md").write_text("## Section\n\n# Main Title\n")
+        (prompts_dir / "spaced.md").write_text("#  Spaced Title  \n\nBody\n")
+
+        manager = TemplateManager(prompts_dir)
+        manager.template_dirs = [prompts_dir]
+
+        assert manager.list_templates_with_descriptions() == [
+            ("nested", "nested"),
+            ("spaced", "Spaced Title"),
+        ]
+
+    @pytest.mark.parametrize("indent", [" ", "  ", "   "], ids=["1", "2", "3"])
+    def test_list_with_descriptions_indented_heading(self, prompts_dir, indent):
+        """Test that a heading indented by up to three spaces still counts."""
+        (prompts_dir / "indented.md").write_text(f"{indent}# Title\n\n{{input}}\n")
+
+        manager = TemplateManager(prompts_dir)
+        manager.template_dirs = [prompts_dir]
+
+        assert manager.list_templates_with_descriptions() == [("indented", "Title")]
+
+    def test_describe_templates(self, prompts_dir, populated_prompts_dir):
+        """Test the name -> description mapping API."""
+        manager = TemplateManager(prompts_dir)
+        manager.template_dirs = [prompts_dir]
+
+        assert manager.describe_templates() == {
+            "complex": "Complex Template",
+            "review": "Code Review",
+            "simple": "simple",
+        }
+
 
 class TestLoadTemplate:
     """Test loading individual templates."""
@@ -196,6 +294,170 @@ class TestLoadTemplate:
         assert "{extra}" in content
         assert "{something}" in content
 
+    def test_load_template_literal_braces_preserved(self, prompts_dir):
+        """Test that braces other than {input} are left exactly as written."""
+        (prompts_dir / "json.md").write_text(
+            'Return JSON like {"name": "x"} or {{escaped}} for: {input}'
+        )
+
+        manager = TemplateManager(prompts_dir)
+        manager.template_dirs = [prompts_dir]
+        content = manager.load_template("json", "data")
+
+        assert content == 'Return JSON like {"name": "x"} or {{escaped}} for: data'
+
+    def test_load_template_repeated_input_placeholder(self, prompts_dir):
+        """Test that every {input} placeholder is substituted."""
+        (prompts_dir / "twice.md").write_text("Before: {input}\nAfter: {input}")
+
+        manager = TemplateManager(prompts_dir)
+        manager.template_dirs = [prompts_dir]
+        content = manager.load_template("twice", "x")
+
+        assert content == "Before: x\nAfter: x"
+
+
+class TestTemplateCache:
+    """Test caching of parsed template files."""
+
+    def test_repeated_load_reuses_cached_read(self, prompts_dir, populated_prompts_dir):
+        """Test that unchanged templates are not re-read from disk."""
+        manager = TemplateManager(prompts_dir)
+        manager.template_dirs = [prompts_dir]
+        manager.load_template("review", "first")
+
+        with patch(READ_PATCH_TARGET, side_effect=AssertionError("re-read")):
+            content = manager.load_template("review", "second")
+            info = manager.get_template_info("review")
+
+        assert "second" in content
+        assert info == ("review", "Code Review")
+
+    def test_edited_template_is_reloaded(self, prompts_dir, populated_prompts_dir):
+        """Test that editing a template invalidates its cache entry."""
+        manager = TemplateManager(prompts_dir)
+        manager.template_dirs = [prompts_dir]
+        assert manager.load_template("simple") == "This is a simple template."
+
+        (prompts_dir / "simple.md").write_text("# Edited\n\nNew simple template body.")
+
+        assert (
+            manager.load_template("simple") == "# Edited\n\nNew simple template body."
+        )
+        assert manager.get_template_info("simple") == ("simple", "Edited")
+
+    def test_directory_listing_is_reused(self, prompts_dir, populated_prompts_dir):
+        """Test that an unchanged directory is not rescanned."""
+        manager = TemplateManager(prompts_dir)
+        manager.template_dirs = [prompts_dir]
+        assert len(manager.list_templates()) == 3
+
+        with patch("os.scandir", side_effect=AssertionError("rescanned")):
+            assert len(manager.list_templates()) == 3
+            assert manager.load_template("simple") == "This is a simple template."
+
+    def test_added_template_is_listed(self, prompts_dir, populated_prompts_dir):
+        """Test that adding a template invalidates the directory listing."""
+        manager = TemplateManager(prompts_dir)
+        manager.template_dirs = [prompts_dir]
+        assert "added" not in manager.list_templates()
+
+        (prompts_dir / "added.md").write_text("# Added\n\nNew template")
+        # Bump the directory mtime in case the filesystem clock is coarse
+        os.utime(prompts_dir, ns=(0, prompts_dir.stat().st_mtime_ns + 1))
+
+        assert "added" in manager.list_templates()
+        assert manager.load_template("added") == "# Added\n\nNew template"
+
+    def test_large_template_description_not_fully_read(self, prompts_dir):
+        """Test that listing a large template maps it instead of reading it."""
+        body = "x" * DESCRIPTION_MMAP_MIN_SIZE
+        (prompts_dir / "big.md").write_text(f"# Big Template\n\n{body}\n{{input}}")
+
+        manager = TemplateManager(prompts_dir)
+        manager.template_dirs = [prompts_dir]
+
+        with patch(READ_PATCH_TARGET, side_effect=AssertionError("read in full")):
+            assert manager.describe_templates() == {"big": "Big Template"}
+
+        content = manager.load_template("big", "tail")
+        assert content.startswith("# Big Template")
+        assert content.endswith(f"{body}\ntail")
+
+    def test_large_template_description_after_front_matter(self, prompts_dir):
+        """Test that the mapped scan also skips front matter."""
+        body = "# not the title\n" * DESCRIPTION_MMAP_MIN_SIZE
+        (prompts_dir / "big.md").write_bytes(
+            f"---\r\nname: big\r\n---\r\n\r\n# Big Command\r\n{body}".encode()
+        )
+
+        manager = TemplateManager(prompts_dir)
+        manager.template_dirs = [prompts_dir]
+
+        with patch(READ_PATCH_TARGET, side_effect=AssertionError("read in full")):
+            assert manager.describe_templates() == {"big": "Big Command"}
+
+    def test_warm_up_populates_directory_index(
+        self, prompts_dir, populated_prompts_dir
+    ):
+        """Test that the background warm-up lists the template directories."""
+        manager = TemplateManager(prompts_dir)
+        manager._warm_thread.join(timeout=5)
+        assert not manager._warm_thread.is_alive()
+
+        _, index = manager._dir_index[prompts_dir]
+        assert sorted(index) == ["complex", "review", "simple"]
+
+    def test_load_template_during_warm_up(self, prompts_dir, populated_prompts_dir):
+        """Test that a lookup racing the warm-up waits for it, then succeeds."""
+        started = threading.Event()
+        release = threading.Event()
+        real_iter_md = TemplateManager._iter_md
+
+        def blocking_iter_md(directory):
+            # Hold the index lock inside the warm-up until the test says go
+            started.set()
+            assert release.wait(timeout=5)
+            return real_iter_md(directory)
+
+        results = []
+        with patch.object(TemplateManager, "_iter_md", side_effect=blocking_iter_md):
+            manager = TemplateManager(prompts_dir)
+            assert started.wait(timeout=5)
+
+            loader = threading.Thread(
+                target=lambda: results.append(manager.load_template("review", "x"))
+            )
+            loader.start()
+            # The lookup needs the same directory, so it waits on the warm-up
+            loader.join(timeout=0.05)
+            assert loader.is_alive()
+            release.set()
+            loader.join(timeout=5)
+            manager._warm_thread.join(timeout=5)
+
+        assert not loader.is_alive()
+        assert not manager._warm_thread.is_alive()
+        assert results == ["# Code Review\n\nPlease review the following:\n\nx"]
+
+    @pytest.mark.parametrize(
+        "error",
+        [
+            pytest.param(OSError(19, "No such device"), id="oserror"),
+            pytest.param(ValueError("cannot mmap"), id="valueerror"),
+        ],
+    )
+    def test_large_template_description_without_mmap_support(self, prompts_dir, error):
+        """Test that large templates keep their heading where mapping fails."""
+        body = "x" * DESCRIPTION_MMAP_MIN_SIZE
+        (prompts_dir / "big.md").write_text(f"# Big Template\n\n{body}\n")
+
+        manager = TemplateManager(prompts_dir)
+        manager.template_dirs = [prompts_dir]
+
+        with patch("mmap.mmap", side_effect=error):
+            assert manager.describe_templates() == {"big": "Big Template"}
+
 
 class TestEdgeCases:
     """Test edge cases and error handling."""
@@ -224,6 +486,36 @@ class TestEdgeCases:
         assert "Content without placeholder" in content
         assert "extra text" in content
 
+    def test_crlf_line_endings_normalized(self, prompts_dir):
+        """Test that Windows line endings are normalized like text mode."""
+        (prompts_dir / "windows.md").write_bytes(b"# Windows\r\n\r\nBody: {input}\r\n")
+
+        manager = TemplateManager(prompts_dir)
+        manager.template_dirs = [prompts_dir]
+
+        assert manager.load_template("windows", "x") == "# Windows\n\nBody: x\n"
+        assert manager.get_template_info("windows") == ("windows", "Windows")
+
+    def test_short_read_keeps_reading(self, prompts_dir):
+        """Test that a partial first read does not truncate the template."""
+        (prompts_dir / "partial.md").write_text("# Partial\n\nBody: {input}\n")
+        real_read = os.read
+        calls = []
+
+        def short_read(fd, n):
+            calls.append(n)
+            # Return only a few bytes on the first call
+            return real_read(fd, 4 if len(calls) == 1 else n)
+
+        manager = TemplateManager(prompts_dir)
+        manager.template_dirs = [prompts_dir]
+
+        with patch("os.read", side_effect=short_read):
+            content = manager.load_template("partial", "x")
+
+        assert content == "# Partial\n\nBody: x\n"
+        assert len(calls) > 1
+
     def test_unicode_in_template(self, prompts_dir):
         """Test template with unicode characters."""
         (prompts_dir / "unicode.md").write_text(
@@ -344,6 +636,24 @@ class TestMultiDirectorySupport:
         assert "user_only" in templates
         assert "shared" in templates
 
+    def test_list_with_descriptions_uses_priority_order(self, multi_dir_setup):
+        """Test that descriptions come from the highest priority directory."""
+        manager = TemplateManager(multi_dir_setup["base"])
+        manager.template_dirs = [
+            multi_dir_setup["base"],
+            multi_dir_setup["project"],
+            multi_dir_setup["user"],
+        ]
+
+        templates = manager.list_templates_with_descriptions()
+
+        assert templates == [
+            ("base_only", "Base Only"),
+            ("project_only", "Project Only"),
+            ("shared", "Shared Base"),
+            ("user_only", "User Only"),
+        ]
+
     def test_load_template_priority_order(self, multi_dir_setup):
         """Test that templates are loaded from highest priority directory."""
         manager = TemplateManager(multi_dir_setup["base"])
@@ -395,6 +705,84 @@ class TestMultiDirectorySupport:
         grouped = manager.list_templates_grouped()
         assert len(grouped) == 1  # Only base_dir exists
 
+    def test_unreadable_directory_treated_as_empty(self, multi_dir_setup):
+        """Test that a directory that cannot be listed is skipped, not fatal."""
+        manager = TemplateManager(multi_dir_setup["base"])
+        manager.template_dirs = [
+            multi_dir_setup["base"],
+            multi_dir_setup["project"],
+            multi_dir_setup["user"],
+        ]
+        unreadable = str(multi_dir_setup["project"])
+        real_scandir = os.scandir
+
+        def scandir(path):
+            if os.fspath(path) == unreadable:
+                raise PermissionError(13, "Permission denied", unreadable)
+            return real_scandir(path)
+
+        with patch("os.scandir", side_effect=scandir):
+            assert manager.list_templates() == ["base_only", "shared", "user_only"]
+            grouped = manager.list_templates_grouped()
+            assert [d for d, _ in grouped] == [
+                multi_dir_setup["base"],
+                multi_dir_setup["user"],
+            ]
+            # Lookups by name still probe the file itself, as before the index
+            assert manager.get_template_info("project_only") == (
+                "project_only",
+                "Project Only",
+            )
+            assert "Template from project" in manager.load_template("project_only")
+            assert "Template from user" in manager.load_template("user_only")
+
+    def test_load_template_skips_directory_that_fails_to_index(self, multi_dir_setup):
+        """Test that an indexing error falls through to the next directory."""
+        manager = TemplateManager(multi_dir_setup["base"])
+        manager.template_dirs = [
+            multi_dir_setup["base"],
+            multi_dir_setup["project"],
+            multi_dir_setup["user"],
+        ]
+        real_index = manager._index
+
+        def index(directory):
+            if directory == multi_dir_setup["base"]:
+                raise RuntimeError("index failed")
+            return real_index(directory)
+
+        with patch.object(manager, "_index", side_effect=index):
+            content = manager.load_template("shared")
+            assert "From project directory" in content
+            assert manager.load_template("base_only") is None
+
+    def test_lookup_falls_back_to_file_probe(self, prompts_dir, populated_prompts_dir):
+        """Test that names missing from the listing are still probed on disk.
+
+        This is how case-insensitive filesystems resolve "Review" to review.md;
+        an empty listing stands in for the case mismatch here.
+        """
+        manager = TemplateManager(prompts_dir)
+        manager.template_dirs = [prompts_dir]
+
+        with patch.object(manager, "_index", return_value={}):
+            assert manager.load_template("review", "x").endswith("following:\n\nx")
+            assert manager.get_template_info("review") == ("review", "Code Review")
+            assert manager.load_template("missing") is None
+            assert manager.get_template_info("missing") is None
+
+    def test_lookup_case_insensitive_filesystem(
+        self, prompts_dir, populated_prompts_dir
+    ):
+        """Test that a differently cased name loads where the filesystem allows."""
+        if not (prompts_dir / "REVIEW.md").exists():
+            pytest.skip("filesystem is case-sensitive")
+
+        manager = TemplateManager(prompts_dir)
+        manager.template_dirs = [prompts_dir]
+
+        assert manager.load_template("Review") is not None
+
     def test_get_template_info_from_specific_directory(self, multi_dir_setup):
         """Test getting template info from a specific directory."""
         manager = TemplateManager(multi_dir_setup["base"])
@@ -26,3 +26,19 @@ def test_format_tokens():
     assert tracker.format_tokens(500) == "500"
     assert tracker.format_tokens(1_500) == "1.5K"
     assert tracker.format_tokens(2_500_000) == "2.5M"
+
+
+def test_format_tokens_static():
+    """Test format_tokens works without an instance, including boundaries."""
+    assert TokenTracker.format_tokens(999) == "999"
+    assert TokenTracker.format_tokens(1_000) == "1.0K"
+    assert TokenTracker.format_tokens(1_000_000) == "1.0M"
+
+
+def test_format_tokens_rounding_boundaries():
+    """Test half-up rounding and the K -> M promotion near one million."""
+    assert TokenTracker.format_tokens(1_250) == "1.3K"
+    assert TokenTracker.format_tokens(5_949) == "5.9K"
+    assert TokenTracker.format_tokens(999_949) == "999.9K"
+    assert TokenTracker.format_tokens(999_950) == "1.0M"
+    assert TokenTracker.format_tokens(2_250_000) == "2.3M"
@@ -1,7 +1,10 @@
 """Tests for UI components."""
 
+import io
 import time
 
+import pytest
+
 from basic_agent_chat_loop.components.ui_components import (
     COLOR_PALETTE,
     Colors,
@@ -109,6 +112,20 @@ class TestColors:
         # Should remain unchanged
         assert Colors.USER == original_user
 
+    def test_configure_ignores_unknown_keys(self):
+        """Test that unrecognized config keys do not create attributes."""
+        original_dim = Colors.DIM
+
+        try:
+            Colors.configure({"dim": "cyan", "highlight": "red"})
+
+            assert Colors.DIM == COLOR_PALETTE["cyan"]
+            assert not hasattr(Colors, "HIGHLIGHT")
+            assert not hasattr(Colors, "highlight")
+
+        finally:
+            Colors.DIM = original_dim
+
     def test_resolve_color_with_color_name(self):
         """Test resolving color names to ANSI codes."""
         assert Colors._resolve_color("bright_green") == COLOR_PALETTE["bright_green"]
@@ -200,6 +217,20 @@ class TestColors:
         assert COLOR_PALETTE["bright_green"] in formatted
         assert "[Thinking...]" in formatted
 
+    def test_format_agent_response_exact_output(self):
+        """Test each line is wrapped in its own color and reset."""
+        tool = COLOR_PALETTE["bright_green"]
+        formatted = Colors.format_agent_response("Hi\n[Tool]\nTool #1: x\n")
+
+        assert formatted == "\n".join(
+            [
+                f"{Colors.AGENT}Hi{Colors.RESET}",
+                f"{tool}[Tool]{Colors.RESET}",
+                f"{tool}Tool #1: x{Colors.RESET}",
+                f"{Colors.AGENT}{Colors.RESET}",
+            ]
+        )
+
 
 class TestColorPalette:
     """Test COLOR_PALETTE constant."""
@@ -273,6 +304,16 @@ class TestStatusBar:
         assert "m" in session_time
         assert "s" in session_time
 
+    def test_get_session_time_exact(self):
+        """Test exact session time strings, including after start_time moves."""
+        status = StatusBar("Test", "Model")
+        status.start_time = time.time() - 125
+        assert status.get_session_time() == "2m 5s"
+
+        # Restoring a session resets start_time; the new value must be used
+        status.start_time = time.time() - 7
+        assert status.get_session_time() == "7s"
+
     def test_increment_query(self):
         """Test incrementing query counter."""
         status = StatusBar("Test", "Model")
@@ -297,6 +338,16 @@ class TestStatusBar:
         status.update_tokens(3000)
         assert status.total_tokens == 3000
 
+    def test_update_tokens_stores_int(self):
+        """Test that token totals are normalized to int."""
+        status = StatusBar("Test", "Model", show_tokens=True)
+
+        status.update_tokens(1500.0)
+
+        assert status.total_tokens == 1500
+        assert type(status.total_tokens) is int
+        assert "1.5K tokens" in status.render()
+
     def test_render_basic(self):
         """Test basic status bar rendering."""
         status = StatusBar("Test Agent", "Claude Sonnet 4.5")
@@ -375,6 +426,26 @@ class TestStatusBar:
         rendered = status.render()
         assert "2.5M tokens" in rendered
 
+    @pytest.mark.parametrize(
+        "tokens,expected",
+        [
+            (999, "999 tokens"),
+            (1_000, "1.0K tokens"),
+            (1_050, "1.1K tokens"),
+            (5_500, "5.5K tokens"),
+            (999_949, "999.9K tokens"),
+            (999_950, "1.0M tokens"),
+            (1_250_000, "1.3M tokens"),
+            (2_500_000, "2.5M tokens"),
+        ],
+    )
+    def test_render_token_formatting(self, tokens, expected):
+        """Test token count rounding and K/M boundaries."""
+        status = StatusBar("Test", "Model", show_tokens=True)
+        status.total_tokens = tokens
+
+        assert f"│ {expected} │" in status.render()
+
     def test_render_border_alignment(self):
         """Test that borders are properly aligned."""
         status = StatusBar("Test", "Model")
@@ -388,6 +459,40 @@ class TestStatusBar:
         # All lines should have same length
         assert len(lines[0]) == len(lines[1]) == len(lines[2])
 
+    def test_render_border_alignment_after_width_change(self):
+        """Test that cached borders follow the status line width."""
+        status = StatusBar("Test", "Model")
+        first = status.render().split("\n")
+
+        status.query_count = 12345
+        lines = status.render().split("\n")
+
+        assert len(lines[0]) == len(lines[1]) == len(lines[2])
+        assert len(lines[0]) > len(first[0])
+
+    def test_render_reflects_direct_field_changes(self):
+        """Test that the render cache notices fields assigned directly."""
+        status = StatusBar("Test", "Model", show_tokens=True)
+        first = status.render()
+        assert status.render() == first
+
+        status.query_count = 3
+        status.total_tokens = 500
+        rendered = status.render()
+
+        assert "3 queries" in rendered
+        assert "500 tokens" in rendered
+
+    def test_render_to_matches_render(self):
+        """Test that render_to writes the same text render returns."""
+        status = StatusBar("Test", "Model", show_tokens=True)
+        status.total_tokens = 1500
+        buf = io.StringIO()
+
+        status.render_to(buf)
+
+        assert buf.getvalue() == status.render()
+
     def test_session_time_in_render(self):
         """Test that session time appears in rendered output."""
         status = StatusBar("Test", "Model")
@@ -1,583 +1,402 @@
 """Tests for UsageExtractor component."""
 
-from basic_agent_chat_loop.components.usage_extractor import UsageExtractor
-
-
-class TestTokenExtractionBasic:
-    """Test basic token usage extraction."""
-
-    def test_extract_none_response(self):
-        """Test extraction from None response."""
-        extractor = UsageExtractor()
-        result = extractor.extract_token_usage(None)
-        assert result is None
+import copy
+from types import SimpleNamespace
 
-    def test_extract_empty_dict(self):
-        """Test extraction from empty dict."""
-        extractor = UsageExtractor()
-        result = extractor.extract_token_usage({})
-        assert result is None
+import pytest
 
-    def test_extract_empty_object(self):
-        """Test extraction from object without usage."""
-        extractor = UsageExtractor()
-
-        class EmptyResponse:
-            pass
-
-        result = extractor.extract_token_usage(EmptyResponse())
-        assert result is None
-
-
-class TestBedrockAccumulatedUsage:
-    """Test AWS Bedrock accumulated usage extraction."""
-
-    def test_extract_bedrock_accumulated_usage(self):
-        """Test extraction from Bedrock accumulated usage."""
-        extractor = UsageExtractor()
-
-        class AccumulatedUsage:
-            inputTokens = 100
-            outputTokens = 50
-
-        class Metrics:
-            accumulated_usage = AccumulatedUsage()
-
-        class Result:
-            metrics = Metrics()
-
-        response = {"result": Result()}
-
-        result = extractor.extract_token_usage(response)
-        assert result is not None
-        usage_dict, is_accumulated = result
-        assert usage_dict == {"input_tokens": 100, "output_tokens": 50}
-        assert is_accumulated is True
-
-    def test_extract_bedrock_dict_usage(self):
-        """Test extraction from Bedrock dict format."""
-        extractor = UsageExtractor()
-
-        class Metrics:
-            accumulated_usage = {"inputTokens": 200, "outputTokens": 100}
+from basic_agent_chat_loop.components.usage_extractor import UsageExtractor
 
-        class Result:
-            metrics = Metrics()
 
-        response = {"result": Result()}
+class _Usage:
+    """Slotted usage object (no __dict__), like compiled SDK usage types."""
 
-        result = extractor.extract_token_usage(response)
-        assert result is not None
-        usage_dict, is_accumulated = result
-        assert usage_dict == {"input_tokens": 200, "output_tokens": 100}
-        assert is_accumulated is True
+    __slots__ = ("input_tokens", "output_tokens")
 
-    def test_extract_bedrock_missing_metrics(self):
-        """Test Bedrock response without metrics."""
-        extractor = UsageExtractor()
+    def __init__(self, input_tokens, output_tokens):
+        self.input_tokens = input_tokens
+        self.output_tokens = output_tokens
 
-        class Result:
-            pass
 
-        response = {"result": Result()}
-        result = extractor.extract_token_usage(response)
-        assert result is None
+class _ClassAttrToolMetrics:
+    """Tool metrics exposed as class attributes rather than instance ones."""
 
-    def test_extract_bedrock_missing_accumulated_usage(self):
-        """Test Bedrock response without accumulated_usage."""
-        extractor = UsageExtractor()
+    tool1 = "call1"
+    tool2 = "call2"
+    _private = "should_ignore"
 
-        class Metrics:
-            pass
 
-        class Result:
-            metrics = Metrics()
+class _RaisingLen:
+    """Tool metrics whose truthiness check raises (stateless, so shared)."""
 
-        response = {"result": Result()}
-        result = extractor.extract_token_usage(response)
-        assert result is None
+    def __len__(self):
+        raise RuntimeError("Broken length")
 
 
-class TestAnthropicStyleUsage:
-    """Test Anthropic/Claude style usage extraction."""
+_RAISING_LEN = _RaisingLen()
 
-    def test_extract_anthropic_usage_object(self):
-        """Test extraction from object with usage attribute."""
-        extractor = UsageExtractor()
 
-        class Usage:
-            input_tokens = 150
-            output_tokens = 75
+# Canonical inputs shared across tests. The extractor only reads its input
+# (pinned by TestEdgeCases.test_extract_does_not_mutate_input), so they are
+# safe to reuse.
+USAGE_100_50 = {"usage": {"input_tokens": 100, "output_tokens": 50}}
+USAGE_200_100 = {"usage": {"input_tokens": 200, "output_tokens": 100}}
+BEDROCK_DICT_USAGE = {"inputTokens": 200, "outputTokens": 100}
+TOOL_METRICS_BY_NAME = {
+    "tool1": ["call1", "call2", "call3"],
+    "tool2": ["call1"],
+    "tool3": ["call1", "call2"],
+}
+TOOL_CALLS = ["call1", "call2", "call3", "call4"]
 
-        class Response:
-            usage = Usage()
+# Expected extraction results, keyed by (input_tokens, output_tokens)
+EXPECTED = {
+    (i, o): {"input_tokens": i, "output_tokens": o}
+    for i, o in ((80, 40), (100, 50), (120, 60), (150, 75), (200, 100), (300, 150))
+}
 
-        result = extractor.extract_token_usage(Response())
-        assert result is not None
-        usage_dict, is_accumulated = result
-        assert usage_dict == {"input_tokens": 150, "output_tokens": 75}
-        assert is_accumulated is False
 
-    def test_extract_anthropic_usage_dict(self):
-        """Test extraction from dict style usage."""
-        extractor = UsageExtractor()
+def _bedrock(**metrics):
+    """Build an AWS Strands style response: {"result": result.metrics}."""
+    return {"result": SimpleNamespace(metrics=SimpleNamespace(**metrics))}
 
-        response = {"usage": {"input_tokens": 250, "output_tokens": 125}}
 
-        result = extractor.extract_token_usage(response)
-        assert result is not None
-        usage_dict, is_accumulated = result
-        assert usage_dict == {"input_tokens": 250, "output_tokens": 125}
-        assert is_accumulated is False
+@pytest.fixture(scope="module")
+def extractor():
+    """Shared extractor (UsageExtractor holds no state between calls)."""
+    return UsageExtractor()
 
 
-class TestOpenAIStyleUsage:
-    """Test OpenAI style usage extraction (prompt_tokens/completion_tokens)."""
+@pytest.fixture(scope="module")
+def extract_token_usage(extractor):
+    """Bound extract_token_usage of the shared extractor."""
+    return extractor.extract_token_usage
 
-    def test_extract_openai_prompt_completion_tokens_object(self):
-        """Test extraction from OpenAI style object."""
-        extractor = UsageExtractor()
 
-        class Usage:
-            prompt_tokens = 300
-            completion_tokens = 150
+@pytest.fixture(scope="module")
+def extract_cycle_count(extractor):
+    """Bound extract_cycle_count of the shared extractor."""
+    return extractor.extract_cycle_count
 
-        class Response:
-            usage = Usage()
 
-        result = extractor.extract_token_usage(Response())
-        assert result is not None
-        usage_dict, is_accumulated = result
-        assert usage_dict == {"input_tokens": 300, "output_tokens": 150}
-        assert is_accumulated is False
+@pytest.fixture(scope="module")
+def extract_tool_count(extractor):
+    """Bound extract_tool_count of the shared extractor."""
+    return extractor.extract_tool_count
 
-    def test_extract_openai_prompt_completion_tokens_dict(self):
-        """Test extraction from OpenAI style dict."""
-        extractor = UsageExtractor()
 
-        response = {"usage": {"prompt_tokens": 400, "completion_tokens": 200}}
-
-        result = extractor.extract_token_usage(response)
-        assert result is not None
-        usage_dict, is_accumulated = result
-        assert usage_dict == {"input_tokens": 400, "output_tokens": 200}
-        assert is_accumulated is False
-
-
-class TestMetadataUsage:
-    """Test usage extraction from metadata."""
-
-    def test_extract_metadata_usage(self):
-        """Test extraction from response.metadata.usage."""
-        extractor = UsageExtractor()
+class TestTokenExtractionBasic:
+    """Test the inputs that carry no usable token usage."""
+
+    @pytest.mark.parametrize(
+        "response",
+        [
+            pytest.param(None, id="none_response"),
+            pytest.param({}, id="empty_dict"),
+            pytest.param(SimpleNamespace(), id="empty_object"),
+            pytest.param({"result": SimpleNamespace()}, id="bedrock_no_metrics"),
+            pytest.param(_bedrock(), id="bedrock_no_accumulated_usage"),
+            pytest.param(
+                {"usage": {"input_tokens": 0, "output_tokens": 0}}, id="zero_tokens"
+            ),
+            pytest.param(
+                {"usage": {"input_tokens": None, "output_tokens": None}},
+                id="none_tokens",
+            ),
+            pytest.param(
+                {"usage": {"input_tokens": "invalid", "output_tokens": []}},
+                id="unconvertible_tokens",
+            ),
+        ],
+    )
+    def test_extract_returns_none(self, extract_token_usage, response):
+        """Test that responses without usable usage yield None."""
+        assert extract_token_usage(response) is None
 
-        class Usage:
-            input_tokens = 100
-            output_tokens = 50
 
-        class Metadata:
-            usage = Usage()
+class TestBedrockAccumulatedUsage:
+    """Test AWS Bedrock accumulated usage extraction."""
 
-        class Response:
-            metadata = Metadata()
+    def test_extract_bedrock_accumulated_usage(self, extract_token_usage):
+        """Test extraction from Bedrock accumulated usage."""
+        accumulated_usage = SimpleNamespace(inputTokens=100, outputTokens=50)
+        response = _bedrock(accumulated_usage=accumulated_usage)
 
-        result = extractor.extract_token_usage(Response())
+        result = extract_token_usage(response)
         assert result is not None
         usage_dict, is_accumulated = result
-        assert usage_dict == {"input_tokens": 100, "output_tokens": 50}
-        assert is_accumulated is False
-
-
-class TestStreamingEventUsage:
-    """Test usage extraction from streaming events."""
-
-    def test_extract_streaming_event_data_usage_object(self):
-        """Test extraction from streaming event with data.usage."""
-        extractor = UsageExtractor()
-
-        class Usage:
-            input_tokens = 80
-            output_tokens = 40
-
-        class Data:
-            usage = Usage()
+        assert usage_dict == EXPECTED[(100, 50)]
+        assert is_accumulated is True
 
-        class Event:
-            data = Data()
+    def test_extract_bedrock_dict_usage(self, extract_token_usage):
+        """Test extraction from Bedrock dict format."""
+        response = _bedrock(accumulated_usage=BEDROCK_DICT_USAGE)
 
-        result = extractor.extract_token_usage(Event())
+        result = extract_token_usage(response)
         assert result is not None
         usage_dict, is_accumulated = result
-        assert usage_dict == {"input_tokens": 80, "output_tokens": 40}
-        assert is_accumulated is False
-
-    def test_extract_streaming_event_data_usage_dict(self):
-        """Test extraction from streaming event with data['usage']."""
-        extractor = UsageExtractor()
-
-        class Data:
-            pass
+        assert usage_dict == EXPECTED[(200, 100)]
+        assert is_accumulated is True
 
-        class Event:
-            data = {"usage": {"input_tokens": 120, "output_tokens": 60}}
 
-        result = extractor.extract_token_usage(Event())
+class TestStandardUsagePatterns:
+    """Test the per-request usage locations on response/event objects."""
+
+    @pytest.mark.parametrize(
+        "response,expected",
+        [
+            # Anthropic/Claude style: response.usage
+            pytest.param(
+                SimpleNamespace(usage=_Usage(input_tokens=150, output_tokens=75)),
+                (150, 75),
+                id="anthropic_object",
+            ),
+            # OpenAI style: prompt_tokens/completion_tokens
+            pytest.param(
+                SimpleNamespace(
+                    usage=SimpleNamespace(prompt_tokens=300, completion_tokens=150)
+                ),
+                (300, 150),
+                id="openai_object",
+            ),
+            pytest.param(
+                SimpleNamespace(
+                    metadata=SimpleNamespace(
+                        usage=_Usage(input_tokens=100, output_tokens=50)
+                    )
+                ),
+                (100, 50),
+                id="metadata_usage",
+            ),
+            # Streaming events: event.data.usage and event.data["usage"]
+            pytest.param(
+                SimpleNamespace(
+                    data=SimpleNamespace(
+                        usage=_Usage(input_tokens=80, output_tokens=40)
+                    )
+                ),
+                (80, 40),
+                id="event_data_object",
+            ),
+            pytest.param(
+                SimpleNamespace(
+                    data={"usage": {"input_tokens": 120, "output_tokens": 60}}
+                ),
+                (120, 60),
+                id="event_data_dict",
+            ),
+        ],
+    )
+    def test_extract_object_usage(self, extract_token_usage, response, expected):
+        """Test extraction from usage found on response or event objects."""
+        result = extract_token_usage(response)
         assert result is not None
         usage_dict, is_accumulated = result
-        assert usage_dict == {"input_tokens": 120, "output_tokens": 60}
+        assert usage_dict == EXPECTED[expected]
         assert is_accumulated is False
 
 
 class TestTokenFieldVariations:
-    """Test different token field name variations."""
-
-    def test_extract_mixed_field_names(self):
-        """Test extraction with mixed field names (inputTokens vs output_tokens)."""
-        extractor = UsageExtractor()
-
-        # Bedrock uses camelCase, others use snake_case
-        response = {"usage": {"inputTokens": 100, "output_tokens": 50}}
-
-        result = extractor.extract_token_usage(response)
+    """Test dict usage across token field names and value types."""
+
+    @pytest.mark.parametrize(
+        "usage,expected",
+        [
+            pytest.param(
+                {"input_tokens": 250, "output_tokens": 125}, (250, 125), id="anthropic"
+            ),
+            pytest.param(
+                {"prompt_tokens": 400, "completion_tokens": 200},
+                (400, 200),
+                id="openai",
+            ),
+            # Bedrock uses camelCase, others use snake_case
+            pytest.param(
+                {"inputTokens": 100, "output_tokens": 50}, (100, 50), id="mixed_names"
+            ),
+            pytest.param(
+                {"input_tokens": 100, "output_tokens": 0}, (100, 0), id="only_input"
+            ),
+            pytest.param(
+                {"input_tokens": 0, "output_tokens": 75}, (0, 75), id="only_output"
+            ),
+            pytest.param(
+                {"input_tokens": "100", "output_tokens": "50"}, (100, 50), id="strings"
+            ),
+            # Floats are truncated to ints
+            pytest.param(
+                {"input_tokens": 100.7, "output_tokens": 50.3}, (100, 50), id="floats"
+            ),
+            pytest.param(
+                {"input_tokens": 1_000_000, "output_tokens": 500_000},
+                (1_000_000, 500_000),
+                id="large",
+            ),
+        ],
+    )
+    def test_extract_dict_usage(self, extract_token_usage, usage, expected):
+        """Test extraction from response['usage'] dicts."""
+        result = extract_token_usage({"usage": usage})
         assert result is not None
         usage_dict, is_accumulated = result
-        assert usage_dict == {"input_tokens": 100, "output_tokens": 50}
+        assert (usage_dict["input_tokens"], usage_dict["output_tokens"]) == expected
         assert is_accumulated is False
 
-    def test_extract_with_zero_tokens(self):
-        """Test extraction when tokens are zero."""
-        extractor = UsageExtractor()
-
-        response = {"usage": {"input_tokens": 0, "output_tokens": 0}}
-
-        result = extractor.extract_token_usage(response)
-        # Should return None when all tokens are zero
-        assert result is None
-
-    def test_extract_with_only_input_tokens(self):
-        """Test extraction with only input tokens."""
-        extractor = UsageExtractor()
-
-        response = {"usage": {"input_tokens": 100, "output_tokens": 0}}
-
-        result = extractor.extract_token_usage(response)
-        assert result is not None
-        usage_dict, is_accumulated = result
-        assert usage_dict == {"input_tokens": 100, "output_tokens": 0}
-
-    def test_extract_with_only_output_tokens(self):
-        """Test extraction with only output tokens."""
-        extractor = UsageExtractor()
-
-        response = {"usage": {"input_tokens": 0, "output_tokens": 75}}
-
-        result = extractor.extract_token_usage(response)
-        assert result is not None
-        usage_dict, is_accumulated = result
-        assert usage_dict == {"input_tokens": 0, "output_tokens": 75}
-
-
-class TestInvalidTokenValues:
-    """Test handling of invalid token values."""
-
-    def test_extract_with_none_tokens(self):
-        """Test extraction when token values are None."""
-        extractor = UsageExtractor()
-
-        response = {"usage": {"input_tokens": None, "output_tokens": None}}
-
-        result = extractor.extract_token_usage(response)
-        assert result is None
-
-    def test_extract_with_string_tokens(self):
-        """Test extraction when token values are strings."""
-        extractor = UsageExtractor()
-
-        response = {"usage": {"input_tokens": "100", "output_tokens": "50"}}
-
-        result = extractor.extract_token_usage(response)
-        assert result is not None
-        usage_dict, is_accumulated = result
-        assert usage_dict == {"input_tokens": 100, "output_tokens": 50}
-
-    def test_extract_with_invalid_token_types(self):
-        """Test extraction when token values cannot be converted to int."""
-        extractor = UsageExtractor()
-
-        response = {"usage": {"input_tokens": "invalid", "output_tokens": []}}
-
-        result = extractor.extract_token_usage(response)
-        assert result is None
-
 
 class TestCycleCountExtraction:
     """Test cycle count extraction."""
 
-    def test_extract_cycle_count_valid(self):
+    def test_extract_cycle_count_valid(self, extract_cycle_count):
         """Test extraction of cycle count from metrics."""
-        extractor = UsageExtractor()
-
-        class Metrics:
-            cycle_count = 5
-
-        class Result:
-            metrics = Metrics()
+        response = _bedrock(cycle_count=5)
 
-        response = {"result": Result()}
-
-        cycle_count = extractor.extract_cycle_count(response)
+        cycle_count = extract_cycle_count(response)
         assert cycle_count == 5
 
-    def test_extract_cycle_count_missing_result(self):
+    def test_extract_cycle_count_missing_result(self, extract_cycle_count):
         """Test cycle count extraction when result is missing."""
-        extractor = UsageExtractor()
-
         response = {}
-        cycle_count = extractor.extract_cycle_count(response)
+        cycle_count = extract_cycle_count(response)
         assert cycle_count is None
 
-    def test_extract_cycle_count_missing_metrics(self):
+    def test_extract_cycle_count_missing_metrics(self, extract_cycle_count):
         """Test cycle count extraction when metrics is missing."""
-        extractor = UsageExtractor()
-
-        class Result:
-            pass
+        response = {"result": SimpleNamespace()}
 
-        response = {"result": Result()}
-
-        cycle_count = extractor.extract_cycle_count(response)
+        cycle_count = extract_cycle_count(response)
         assert cycle_count is None
 
-    def test_extract_cycle_count_missing_cycle_count(self):
+    def test_extract_cycle_count_missing_cycle_count(self, extract_cycle_count):
         """Test cycle count extraction when cycle_count is missing."""
-        extractor = UsageExtractor()
-
-        class Metrics:
-            pass
+        response = _bedrock()
 
-        class Result:
-            metrics = Metrics()
-
-        response = {"result": Result()}
-
-        cycle_count = extractor.extract_cycle_count(response)
+        cycle_count = extract_cycle_count(response)
         assert cycle_count is None
 
-    def test_extract_cycle_count_non_dict_response(self):
+    def test_extract_cycle_count_non_dict_response(self, extract_cycle_count):
         """Test cycle count extraction from non-dict response."""
-        extractor = UsageExtractor()
-
-        class Response:
-            pass
-
-        cycle_count = extractor.extract_cycle_count(Response())
+        cycle_count = extract_cycle_count(SimpleNamespace())
         assert cycle_count is None
 
 
 class TestToolCountExtraction:
     """Test tool usage count extraction."""
 
-    def test_extract_tool_count_dict_format(self):
+    def test_extract_tool_count_dict_format(self, extract_tool_count):
         """Test extraction from dict format tool_metrics."""
-        extractor = UsageExtractor()
+        response = _bedrock(tool_metrics=TOOL_METRICS_BY_NAME)
 
-        class Metrics:
-            tool_metrics = {
-                "tool1": ["call1", "call2", "call3"],
-                "tool2": ["call1"],
-                "tool3": ["call1", "call2"],
-            }
-
-        class Result:
-            metrics = Metrics()
-
-        response = {"result": Result()}
-
-        tool_count = extractor.extract_tool_count(response)
+        tool_count = extract_tool_count(response)
         assert tool_count == 6  # 3 + 1 + 2
 
-    def test_extract_tool_count_list_format(self):
+    def test_extract_tool_count_list_format(self, extract_tool_count):
         """Test extraction from list format tool_metrics."""
-        extractor = UsageExtractor()
-
-        class Metrics:
-            tool_metrics = ["call1", "call2", "call3", "call4"]
-
-        class Result:
-            metrics = Metrics()
+        response = _bedrock(tool_metrics=TOOL_CALLS)
 
-        response = {"result": Result()}
-
-        tool_count = extractor.extract_tool_count(response)
+        tool_count = extract_tool_count(response)
         assert tool_count == 4
 
-    def test_extract_tool_count_object_format(self):
+    def test_extract_tool_count_object_format(self, extract_tool_count):
         """Test extraction from object format tool_metrics."""
-        extractor = UsageExtractor()
-
-        class ToolMetrics:
-            tool1 = "call1"
-            tool2 = "call2"
-            _private = "should_ignore"
-
-        class Metrics:
-            tool_metrics = ToolMetrics()
-
-        class Result:
-            metrics = Metrics()
+        tool_metrics = _ClassAttrToolMetrics()
+        response = _bedrock(tool_metrics=tool_metrics)
 
-        response = {"result": Result()}
-
-        tool_count = extractor.extract_tool_count(response)
+        tool_count = extract_tool_count(response)
         assert tool_count == 2  # Only non-private attributes
 
-    def test_extract_tool_count_empty_dict(self):
+    def test_extract_tool_count_empty_dict(self, extract_tool_count):
         """Test extraction when tool_metrics is empty dict."""
-        extractor = UsageExtractor()
-
-        class Metrics:
-            tool_metrics = {}
-
-        class Result:
-            metrics = Metrics()
+        response = _bedrock(tool_metrics={})
 
-        response = {"result": Result()}
-
-        tool_count = extractor.extract_tool_count(response)
+        tool_count = extract_tool_count(response)
         assert tool_count is None  # Empty tool_metrics returns None
 
-    def test_extract_tool_count_none(self):
+    def test_extract_tool_count_none(self, extract_tool_count):
         """Test extraction when tool_metrics is None."""
-        extractor = UsageExtractor()
-
-        class Metrics:
-            tool_metrics = None
+        response = _bedrock(tool_metrics=None)
 
-        class Result:
-            metrics = Metrics()
-
-        response = {"result": Result()}
-
-        tool_count = extractor.extract_tool_count(response)
+        tool_count = extract_tool_count(response)
         assert tool_count is None
 
-    def test_extract_tool_count_missing_metrics(self):
+    def test_extract_tool_count_missing_metrics(self, extract_tool_count):
         """Test extraction when metrics is missing."""
-        extractor = UsageExtractor()
-
-        class Result:
-            pass
-
-        response = {"result": Result()}
+        response = {"result": SimpleNamespace()}
 
-        tool_count = extractor.extract_tool_count(response)
+        tool_count = extract_tool_count(response)
         assert tool_count is None
 
-    def test_extract_tool_count_missing_tool_metrics(self):
+    def test_extract_tool_count_missing_tool_metrics(self, extract_tool_count):
         """Test extraction when tool_metrics is missing."""
-        extractor = UsageExtractor()
+        response = _bedrock()
 
-        class Metrics:
-            pass
-
-        class Result:
-            metrics = Metrics()
-
-        response = {"result": Result()}
-
-        tool_count = extractor.extract_tool_count(response)
+        tool_count = extract_tool_count(response)
         assert tool_count is None
 
-    def test_extract_tool_count_exception_handling(self):
+    def test_extract_tool_count_exception_handling(self, extract_tool_count):
         """Test that exceptions during extraction are handled gracefully."""
-        extractor = UsageExtractor()
-
-        class BrokenToolMetrics:
-            def __len__(self):
-                raise RuntimeError("Broken length")
-
-        class Metrics:
-            tool_metrics = BrokenToolMetrics()
+        response = _bedrock(tool_metrics=_RAISING_LEN)
 
-        class Result:
-            metrics = Metrics()
-
-        response = {"result": Result()}
-
-        tool_count = extractor.extract_tool_count(response)
+        tool_count = extract_tool_count(response)
         assert tool_count is None
 
 
 class TestExtractorPriority:
     """Test extraction priority order."""
 
-    def test_bedrock_takes_priority_over_standard(self):
+    def test_bedrock_takes_priority_over_standard(self, extract_token_usage):
         """Test that Bedrock accumulated usage is tried first."""
-        extractor = UsageExtractor()
-
-        class AccumulatedUsage:
-            inputTokens = 100
-            outputTokens = 50
-
-        class Metrics:
-            accumulated_usage = AccumulatedUsage()
-
-        class Result:
-            metrics = Metrics()
+        accumulated_usage = SimpleNamespace(inputTokens=100, outputTokens=50)
 
         # Response has both Bedrock and standard usage
         response = {
-            "result": Result(),
+            **_bedrock(accumulated_usage=accumulated_usage),
             "usage": {"input_tokens": 999, "output_tokens": 999},
         }
 
-        result = extractor.extract_token_usage(response)
+        result = extract_token_usage(response)
         assert result is not None
         usage_dict, is_accumulated = result
         # Should use Bedrock values, not standard
-        assert usage_dict == {"input_tokens": 100, "output_tokens": 50}
+        assert usage_dict == EXPECTED[(100, 50)]
         assert is_accumulated is True
 
 
 class TestEdgeCases:
     """Test edge cases and unusual inputs."""
 
-    def test_extract_with_float_tokens(self):
-        """Test extraction with float token values."""
-        extractor = UsageExtractor()
-
-        response = {"usage": {"input_tokens": 100.7, "output_tokens": 50.3}}
-
-        result = extractor.extract_token_usage(response)
-        assert result is not None
-        usage_dict, is_accumulated = result
-        # Should convert floats to ints
-        assert usage_dict == {"input_tokens": 100, "output_tokens": 50}
-
-    def test_extract_with_large_token_counts(self):
-        """Test extraction with very large token counts."""
-        extractor = UsageExtractor()
-
-        response = {"usage": {"input_tokens": 1000000, "output_tokens": 500000}}
-
-        result = extractor.extract_token_usage(response)
-        assert result is not None
-        usage_dict, is_accumulated = result
-        assert usage_dict == {"input_tokens": 1000000, "output_tokens": 500000}
-
-    def test_extract_multiple_calls_independent(self):
+    def test_extract_multiple_calls_independent(self, extract_token_usage):
         """Test that multiple extraction calls are independent."""
-        extractor = UsageExtractor()
-
-        response1 = {"usage": {"input_tokens": 100, "output_tokens": 50}}
-        response2 = {"usage": {"input_tokens": 200, "output_tokens": 100}}
-
-        result1 = extractor.extract_token_usage(response1)
-        result2 = extractor.extract_token_usage(response2)
+        result1 = extract_token_usage(USAGE_100_50)
+        result2 = extract_token_usage(USAGE_200_100)
 
         assert result1 is not None
         assert result2 is not None
         usage1, _ = result1
         usage2, _ = result2
-        assert usage1 == {"input_tokens": 100, "output_tokens": 50}
-        assert usage2 == {"input_tokens": 200, "output_tokens": 100}
+        assert usage1 == EXPECTED[(100, 50)]
+        assert usage2 == EXPECTED[(200, 100)]
+
+    def test_extract_does_not_mutate_input(
+        self, extract_token_usage, extract_cycle_count, extract_tool_count
+    ):
+        """Test that extraction leaves the shared input constants untouched."""
+        inputs = (USAGE_100_50, BEDROCK_DICT_USAGE, TOOL_METRICS_BY_NAME, TOOL_CALLS)
+        snapshot = copy.deepcopy(inputs)
+        response = {
+            **_bedrock(
+                accumulated_usage=BEDROCK_DICT_USAGE,
+                tool_metrics=TOOL_METRICS_BY_NAME,
+            ),
+            **USAGE_100_50,
+        }
+
+        result = extract_token_usage(response)
+        extract_token_usage(USAGE_100_50)
+        extract_cycle_count(response)
+        extract_tool_count(response)
+        extract_tool_count(_bedrock(tool_metrics=TOOL_CALLS))
+
+        assert inputs == snapshot
+        # The returned dict is a fresh object, not the input mapping
+        assert result is not None
+        assert result[0] is not BEDROCK_DICT_USAGE